@@ -8,7 +8,6 @@ Run the Market Maker bot from the project root:
 Or with module syntax:
     python -m src.main
 """
-import asyncio
 import sys
 import os
 
@@ -16,9 +15,10 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from main import main
+from blocky.async_client import AsyncBlocky
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        AsyncBlocky.run_fast_loop(main())
     except KeyboardInterrupt:
         print("\nBot stopped by user.")
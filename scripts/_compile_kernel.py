@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time build of the backtest simulation kernel.
+
+Compiles backtest._simulate_core into a ``backtest_kernel`` extension module
+next to this script, so backtest runs skip Numba's JIT warm-up entirely.
+backtest.py picks the extension up automatically and falls back to the
+@njit version when it is absent.
+
+Usage:
+    python _compile_kernel.py
+"""
+import os
+import sys
+
+from numba.pycc import CC
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from backtest import _simulate_core
+
+# Concrete signature of _simulate_core (AOT needs fixed dtypes)
+KERNEL_SIGNATURE = (
+    "Tuple((f8, f8[:], f8[:], i8[:], i1[:], f8[:], f8[:], f8[:], b1[:], f8[:], i8, i8[:], i8))"
+    "(f8[:], b1[:, :], f8[:, :], f8[:, :], f8[:, :], f8[:, :], f8[:, :], i8[:], f8[:, :], f8)"
+)
+
+cc = CC('backtest_kernel')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export('simulate', KERNEL_SIGNATURE)(_simulate_core.py_func)
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Built backtest_kernel in {cc.output_dir}")
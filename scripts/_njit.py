@@ -0,0 +1,17 @@
+"""
+Optional Numba JIT support.
+
+Exposes ``njit`` from numba when it is installed; otherwise a no-op decorator
+so jitted kernels run as plain Python.
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports @njit and @njit(...))."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
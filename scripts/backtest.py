@@ -4,13 +4,34 @@ Simulates strategy performance using historical OHLCV data.
 """
 import time
 import logging
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
+
+import numpy as np
+
 from config import get_config
+from _njit import njit, NUMBA_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
+# Order side encoding used by the simulation kernel
+SIDE_BUY = 0
+SIDE_SELL = 1
+
+# Candle columns as (field, key, short key, dtype). Columns the simulation
+# reads stay float64: fills compare them exactly against 2-decimal quotes.
+CANDLE_FIELDS = (
+    ('ts', 'timestamp', 'time', np.float64),
+    ('open', 'open', 'o', np.float32),
+    ('high', 'high', 'h', np.float64),
+    ('low', 'low', 'l', np.float64),
+    ('close', 'close', 'c', np.float64),
+    ('volume', 'volume', 'v', np.float32),
+)
+
 
 @dataclass
 class Candle:
@@ -66,6 +87,147 @@ class BacktestResult:
         return (self.final_capital - self.initial_capital) / self.initial_capital * 100
 
 
+def _round_cents(values: np.ndarray) -> np.ndarray:
+    """Round to 2 decimals exactly like round(); np.round differs on half-cent values."""
+    return np.fromiter(map(round, values.tolist(), itertools.repeat(2)),
+                       dtype=np.float64, count=values.size)
+
+
+@dataclass
+class _AlignedCandles:
+    """All loaded markets aligned to one timeline, as (n_markets, n_steps) arrays."""
+    timeline: np.ndarray
+    markets: List[str]
+    bases: List[str]
+    present: np.ndarray  # bool: market has a candle at this step
+    candle_idx: List[np.ndarray]  # per market: candle index of each present step
+    lows: np.ndarray
+    highs: np.ndarray
+    market_base: np.ndarray  # market index -> base index
+    base_marks: np.ndarray  # (n_bases, n_steps) valuation price, NaN if none yet
+
+
+@njit(cache=True, nogil=True)
+def _simulate_core(timeline, present, lows, highs, buy_prices, sell_prices,
+                   quantities, market_base, base_marks, initial_capital):
+    """
+    Sequential fill/inventory state machine of the backtest.
+    
+    All per-candle inputs are (n_markets, n_steps) arrays aligned to ``timeline``;
+    ``present[m, t]`` is False where market m has no candle at step t.
+    ``base_marks[b, t]`` is the price base asset b is valued at after step t
+    (NaN if it has no price yet).
+    Orders are kept as parallel arrays in placement order.
+    
+    Returns:
+        (capital, inventory, equity_curve, order_market, order_side, order_price,
+         order_qty, order_ts, order_filled, order_fill_ts, n_orders, trade_orders, n_trades)
+    """
+    n_markets, n_steps = present.shape
+    n_bases = base_marks.shape[0]
+    # At most one buy and one sell are placed per market candle
+    max_orders = 2 * np.count_nonzero(present)
+    
+    order_market = np.empty(max_orders, dtype=np.int64)
+    order_side = np.empty(max_orders, dtype=np.int8)
+    order_price = np.empty(max_orders, dtype=np.float64)
+    order_qty = np.empty(max_orders, dtype=np.float64)
+    order_ts = np.empty(max_orders, dtype=np.float64)
+    order_filled = np.zeros(max_orders, dtype=np.bool_)
+    order_fill_ts = np.zeros(max_orders, dtype=np.float64)
+    n_orders = 0
+    # Index of the open order per (market, side), -1 when none is open
+    open_order = np.full((n_markets, 2), -1, dtype=np.int64)
+    
+    trade_orders = np.empty(max_orders, dtype=np.int64)
+    n_trades = 0
+    
+    capital = initial_capital
+    inventory = np.zeros(n_bases, dtype=np.float64)
+    equity_curve = np.empty(n_steps + 1, dtype=np.float64)
+    equity_curve[0] = initial_capital
+    
+    for t in range(n_steps):
+        ts = timeline[t]
+        for m in range(n_markets):
+            if not present[m, t]:
+                continue
+            base = market_base[m]
+            low = lows[m, t]
+            high = highs[m, t]
+            
+            # Check the open orders of this market for fills, in placement order.
+            # At most one buy and one sell can be open per market.
+            first = open_order[m, SIDE_BUY]
+            second = open_order[m, SIDE_SELL]
+            if first < 0 or (second >= 0 and second < first):
+                first, second = second, first
+            for o in (first, second):
+                if o < 0:
+                    continue
+                side = order_side[o]
+                if side == SIDE_BUY:
+                    hit = low <= order_price[o]
+                else:
+                    hit = high >= order_price[o]
+                if hit:
+                    order_filled[o] = True
+                    order_fill_ts[o] = ts
+                    open_order[m, side] = -1
+                    value = order_price[o] * order_qty[o]
+                    if side == SIDE_BUY:
+                        capital -= value
+                        inventory[base] += order_qty[o]
+                    else:
+                        capital += value
+                        inventory[base] -= order_qty[o]
+                    trade_orders[n_trades] = o
+                    n_trades += 1
+            
+            buy_price = buy_prices[m, t]
+            quantity = quantities[m, t]
+            
+            # Place buy order if we have capital and none is open
+            if capital >= buy_price * quantity and quantity > 0 and open_order[m, SIDE_BUY] < 0:
+                order_market[n_orders] = m
+                order_side[n_orders] = SIDE_BUY
+                order_price[n_orders] = buy_price
+                order_qty[n_orders] = quantity
+                order_ts[n_orders] = ts
+                open_order[m, SIDE_BUY] = n_orders
+                n_orders += 1
+            
+            # Place sell order if we have inventory and none is open
+            if inventory[base] >= quantity and quantity > 0 and open_order[m, SIDE_SELL] < 0:
+                order_market[n_orders] = m
+                order_side[n_orders] = SIDE_SELL
+                order_price[n_orders] = sell_prices[m, t]
+                order_qty[n_orders] = quantity
+                order_ts[n_orders] = ts
+                open_order[m, SIDE_SELL] = n_orders
+                n_orders += 1
+        
+        # Value inventory at each base's mark price
+        equity = capital
+        for b in range(n_bases):
+            if inventory[b] != 0 and not np.isnan(base_marks[b, t]):
+                equity += inventory[b] * base_marks[b, t]
+        equity_curve[t + 1] = equity
+    
+    return (capital, inventory, equity_curve, order_market, order_side, order_price,
+            order_qty, order_ts, order_filled, order_fill_ts, n_orders, trade_orders, n_trades)
+
+try:
+    # Ahead-of-time build from _compile_kernel.py, if present
+    from backtest_kernel import simulate as _simulate_kernel
+    # pycc exports hold the GIL
+    _KERNEL_RELEASES_GIL = False
+except ImportError:
+    _simulate_kernel = _simulate_core
+    # Only the @njit(nogil=True) build releases it; the fallback is plain Python
+    _KERNEL_RELEASES_GIL = NUMBA_AVAILABLE
+
+
 class BacktestEngine:
     """
     Simple backtesting engine for market making strategies.
@@ -87,7 +249,9 @@ class BacktestEngine:
         self.initial_capital = initial_capital
         self.capital = initial_capital
         self.inventory: Dict[str, float] = defaultdict(float)
-        self.candles: Dict[str, List[Candle]] = {}
+        # Per-market structure-of-arrays: {'ts', 'open', 'high', 'low', 'close', 'volume'} -> ndarray
+        self.candles: Dict[str, Dict[str, np.ndarray]] = {}
+        self._base: Dict[str, str] = {}  # market -> base asset
         self.orders: List[SimulatedOrder] = []
         self.trades: List[Dict] = []
         self._order_id = 0
@@ -96,25 +260,24 @@ class BacktestEngine:
         """
         Load candle data for a market.
         
+        Candles are stored as one array per field (see CANDLE_FIELDS), sorted by timestamp.
+        
         Args:
             market: Market symbol (e.g., 'diam_iron')
             candles: List of candle dicts with keys: timestamp, open, high, low, close, volume
         """
-        self.candles[market] = [
-            Candle(
-                timestamp=c.get('timestamp', c.get('time', 0)),
-                open=float(c.get('open', c.get('o', 0))),
-                high=float(c.get('high', c.get('h', 0))),
-                low=float(c.get('low', c.get('l', 0))),
-                close=float(c.get('close', c.get('c', 0))),
-                volume=float(c.get('volume', c.get('v', 0)))
-            )
-            for c in candles
-        ]
+        n = len(candles)
+        columns = {
+            field: np.fromiter((c.get(key, c.get(alias, 0)) for c in candles), dtype=dtype, count=n)
+            for field, key, alias, dtype in CANDLE_FIELDS
+        }
+        order = np.argsort(columns['ts'], kind='stable')
+        self.candles[market] = {field: values[order] for field, values in columns.items()}
+        self._base[market] = market.split('_', 1)[0]
         logger.info(f"Loaded {len(candles)} candles for {market}")
     
     def fetch_candles_from_api(self, client, market: str, timeframe: str = "1H", 
-                                limit: int = 1000) -> List[Candle]:
+                                limit: int = 1000) -> List[Dict]:
         """
         Fetch candles from Blocky API.
         
@@ -123,33 +286,83 @@ class BacktestEngine:
             market: Market symbol
             timeframe: Candle timeframe (1m, 5m, 15m, 1H, 4H, 1D)
             limit: Maximum candles to fetch
+            
+        Returns:
+            The raw candle dicts that were loaded (empty on failure)
+        """
+        return self._load_fetched(market, self._request_candles(client, market, timeframe, limit))
+    
+    def fetch_candles_many(self, client, markets: List[str], timeframe: str = "1H",
+                           limit: int = 1000, max_workers: int = 8) -> List[List[Dict]]:
+        """
+        Fetch candles for several markets concurrently.
+        
+        The HTTP requests run on a thread pool (they release the GIL while
+        waiting on the network); the candles are then loaded in the order of
+        markets, so the engine state matches sequential fetch_candles_from_api calls.
+        
+        Args:
+            client: Blocky client instance (thread-safe)
+            markets: Market symbols
+            timeframe: Candle timeframe (1m, 5m, 15m, 1H, 4H, 1D)
+            limit: Maximum candles to fetch per market
+            max_workers: Maximum concurrent requests
+            
+        Returns:
+            The raw candle dicts loaded for each market, in order (empty on failure)
         """
+        if not markets:
+            return []
+        
+        def request(market: str) -> Optional[List[Dict]]:
+            return self._request_candles(client, market, timeframe, limit)
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(markets))) as executor:
+            responses = list(executor.map(request, markets))
+        return [self._load_fetched(market, candles) for market, candles in zip(markets, responses)]
+    
+    def _request_candles(self, client, market: str, timeframe: str,
+                         limit: int) -> Optional[List[Dict]]:
+        """Request candles from the API; None if the request failed or returned none."""
         try:
             response = client.get_ohlcv(market, timeframe=timeframe)
             if response.get('success') and 'candles' in response:
-                self.load_candles(market, response['candles'][:limit])
-                return self.candles.get(market, [])
+                return response['candles'][:limit]
+        except Exception as e:
+            logger.error(f"Failed to fetch candles for {market}: {e}")
+        return None
+    
+    def _load_fetched(self, market: str, candles: Optional[List[Dict]]) -> List[Dict]:
+        """Load fetched candles into the engine; returns them (empty on failure)."""
+        if candles is None:
+            return []
+        try:
+            self.load_candles(market, candles)
+            return candles
         except Exception as e:
             logger.error(f"Failed to fetch candles for {market}: {e}")
         return []
     
-    def _simulate_fill(self, order: SimulatedOrder, candle: Candle) -> bool:
-        """Check if order would be filled during candle."""
-        if order.side == 'buy':
-            # Buy order fills if price drops to or below order price
-            if candle.low <= order.price:
-                order.filled = True
-                order.fill_price = order.price  # Assume limit fill
-                order.fill_timestamp = candle.timestamp
-                return True
-        else:
-            # Sell order fills if price rises to or above order price
-            if candle.high >= order.price:
-                order.filled = True
-                order.fill_price = order.price
-                order.fill_timestamp = candle.timestamp
-                return True
-        return False
+    def _quote_arrays(self, candles: Dict[str, np.ndarray], spread: float,
+                      target_value: float, min_spread_ticks: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Compute buy price, sell price and quantity for every candle of a market at once."""
+        half_spread = spread / 2
+        half_min_spread = min_spread_ticks / 2
+        mid = (candles['high'] + candles['low']) / 2
+        buy = _round_cents(mid * (1 - half_spread))
+        sell = _round_cents(mid * (1 + half_spread))
+        
+        # Enforce minimum spread
+        narrow = (sell - buy) < min_spread_ticks
+        narrow_mid = mid[narrow]
+        buy[narrow] = _round_cents(narrow_mid - half_min_spread)
+        sell[narrow] = _round_cents(narrow_mid + half_min_spread)
+        
+        # Calculate quantity
+        positive = buy > 0
+        qty = np.zeros_like(buy)
+        qty[positive] = np.minimum(target_value / buy[positive], 6400)
+        return buy, sell, qty
     
     def run(self, spread: float = None, target_value: float = None,
             min_spread_ticks: float = None) -> BacktestResult:
@@ -165,13 +378,14 @@ class BacktestEngine:
             BacktestResult with performance metrics
         """
         # Load defaults from config if not provided
-        cfg = get_config()
-        if spread is None:
-            spread = cfg.trading.spread
-        if target_value is None:
-            target_value = cfg.trading.target_value
-        if min_spread_ticks is None:
-            min_spread_ticks = cfg.trading.min_spread_ticks
+        if spread is None or target_value is None or min_spread_ticks is None:
+            trading = get_config().trading
+            if spread is None:
+                spread = trading.spread
+            if target_value is None:
+                target_value = trading.target_value
+            if min_spread_ticks is None:
+                min_spread_ticks = trading.min_spread_ticks
         
         logger.info(f"Backtest params: spread={spread}, target_value={target_value}, min_spread_ticks={min_spread_ticks}")
         self.capital = self.initial_capital
@@ -184,118 +398,228 @@ class BacktestEngine:
             logger.warning("No candle data loaded. Call load_candles() first.")
             return self._empty_result()
         
-        # Find common time range across all markets
-        all_timestamps = set()
-        for market, candles in self.candles.items():
-            for c in candles:
-                all_timestamps.add(c.timestamp)
-        
-        if not all_timestamps:
+        aligned = self._align_candles()
+        if aligned is None:
             return self._empty_result()
         
-        sorted_timestamps = sorted(all_timestamps)
-        start_time = sorted_timestamps[0]
-        end_time = sorted_timestamps[-1]
+        capital, inventory, orders, trades, trade_pnl, equity_curve = self._simulate(
+            aligned, spread, target_value, min_spread_ticks
+        )
+        self.capital = capital
+        self.inventory.update(inventory)
+        self.orders.extend(orders)
+        self.trades.extend(trades)
+        self._order_id = len(orders)
+        
+        return self._build_result(aligned, self.capital, self.inventory, self.trades,
+                                  trade_pnl, equity_curve)
+    
+    def run_sweep(self, spreads: List[float], target_values: List[float],
+                  min_spread_ticks: float = None,
+                  max_workers: Optional[int] = None) -> List[BacktestResult]:
+        """
+        Run the backtest over every (spread, target_value) combination.
         
-        equity_curve = [self.initial_capital]
-        max_equity = self.initial_capital
-        max_drawdown = 0.0
+        Candles are aligned once. When the kernel is the Numba JIT build
+        (which releases the GIL) the simulations run in parallel on a thread
+        pool; otherwise threads would only contend for the GIL, so they run
+        one after another. Engine state (capital, orders, trades) is left untouched.
         
-        # Simulate each time period
-        for ts in sorted_timestamps:
-            for market, candles in self.candles.items():
-                # Find candle for this timestamp
-                candle = next((c for c in candles if c.timestamp == ts), None)
-                if not candle:
-                    continue
-                
-                # Check existing orders for fills
-                active_orders = [o for o in self.orders if not o.filled and o.market == market]
-                for order in active_orders:
-                    if self._simulate_fill(order, candle):
-                        self._process_fill(order)
-                
-                # Place new orders based on current price
-                mid_price = (candle.high + candle.low) / 2
-                buy_price = round(mid_price * (1 - spread / 2), 2)
-                sell_price = round(mid_price * (1 + spread / 2), 2)
-                
-                # Enforce minimum spread
-                if sell_price - buy_price < min_spread_ticks:
-                    buy_price = round(mid_price - min_spread_ticks / 2, 2)
-                    sell_price = round(mid_price + min_spread_ticks / 2, 2)
-                
-                # Calculate quantity
-                if buy_price > 0:
-                    quantity = min(target_value / buy_price, 6400)
-                else:
-                    quantity = 0
-                
-                base = market.split('_')[0]
-                
-                # Place buy order if we have capital
-                buy_cost = buy_price * quantity
-                if self.capital >= buy_cost and quantity > 0:
-                    if not any(o.market == market and o.side == 'buy' and not o.filled 
-                              for o in self.orders):
-                        self._place_order(market, 'buy', buy_price, quantity, ts)
-                
-                # Place sell order if we have inventory
-                if self.inventory[base] >= quantity and quantity > 0:
-                    if not any(o.market == market and o.side == 'sell' and not o.filled
-                              for o in self.orders):
-                        self._place_order(market, 'sell', sell_price, quantity, ts)
+        Args:
+            spreads: Spread percentages to try
+            target_values: Target order values to try
+            min_spread_ticks: Minimum spread in price units. Defaults to config value.
+            max_workers: Thread pool size when running in parallel (defaults to the executor's default)
             
-            # Calculate current equity
-            current_equity = self.capital
-            for base, qty in self.inventory.items():
-                # Estimate inventory value using last known price
-                for market, candles in self.candles.items():
-                    if market.startswith(base):
-                        last_candle = next((c for c in reversed(candles) if c.timestamp <= ts), None)
-                        if last_candle:
-                            current_equity += qty * last_candle.close
-                            break
+        Returns:
+            One BacktestResult per combination, spreads varying slowest
+        """
+        if min_spread_ticks is None:
+            min_spread_ticks = get_config().trading.min_spread_ticks
+        
+        grid = list(itertools.product(spreads, target_values))
+        aligned = self._align_candles()
+        if aligned is None:
+            return [self._empty_result() for _ in grid]
+        
+        def run_one(params: Tuple[float, float]) -> BacktestResult:
+            spread, target_value = params
+            capital, inventory, _, trades, trade_pnl, equity_curve = self._simulate(
+                aligned, spread, target_value, min_spread_ticks
+            )
+            return self._build_result(aligned, capital, inventory, trades, trade_pnl, equity_curve)
+        
+        if not _KERNEL_RELEASES_GIL:
+            return [run_one(params) for params in grid]
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(run_one, grid))
+    
+    def _align_candles(self) -> Optional[_AlignedCandles]:
+        """Align all loaded markets to one timeline (independent of strategy parameters)."""
+        if not self.candles:
+            return None
+        
+        # Merge all markets into one sorted timeline
+        sorted_timestamps = np.unique(np.concatenate([c['ts'] for c in self.candles.values()]))
+        
+        if sorted_timestamps.size == 0:
+            return None
+        
+        # Align every market to the timeline as (n_markets, n_steps) arrays
+        markets = list(self.candles)
+        shape = (len(markets), sorted_timestamps.size)
+        present = np.zeros(shape, dtype=np.bool_)
+        lows, highs = np.zeros(shape), np.zeros(shape)
+        marks = np.full(shape, np.nan)
+        candle_idx = []
+        for m, market in enumerate(markets):
+            candles = self.candles[market]
+            ts_arr = candles['ts']
+            # Index of the last candle at or before each step; an exact hit means a candle at that step
+            last = np.searchsorted(ts_arr, sorted_timestamps, side='right') - 1
+            seen = last >= 0
+            found = seen.copy()
+            found[seen] = ts_arr[last[seen]] == sorted_timestamps[seen]
+            idx = last[found]
             
-            equity_curve.append(current_equity)
-            if current_equity > max_equity:
-                max_equity = current_equity
-            drawdown = (max_equity - current_equity) / max_equity if max_equity > 0 else 0
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
+            candle_idx.append(idx)
+            present[m] = found
+            lows[m, found] = candles['low'][idx]
+            highs[m, found] = candles['high'][idx]
+            marks[m, seen] = candles['close'][last[seen]]
+        
+        # Integer-index base assets. Each base is marked at the last close of the
+        # first market named after it that has traded by that step.
+        bases = list(dict.fromkeys(self._base[market] for market in markets))
+        base_id = {base: b for b, base in enumerate(bases)}
+        market_base = np.array([base_id[self._base[market]] for market in markets], dtype=np.int64)
+        base_marks = np.full((len(bases), sorted_timestamps.size), np.nan)
+        for b, base in enumerate(bases):
+            for m in reversed([m for m, market in enumerate(markets) if market.startswith(base)]):
+                base_marks[b] = np.where(np.isnan(marks[m]), base_marks[b], marks[m])
+        
+        return _AlignedCandles(
+            timeline=sorted_timestamps,
+            markets=markets,
+            bases=bases,
+            present=present,
+            candle_idx=candle_idx,
+            lows=lows,
+            highs=highs,
+            market_base=market_base,
+            base_marks=base_marks,
+        )
+    
+    def _simulate(self, aligned: _AlignedCandles, spread: float, target_value: float,
+                  min_spread_ticks: float) -> Tuple[float, Dict[str, float], List[SimulatedOrder],
+                                                    List[Dict], np.ndarray, np.ndarray]:
+        """
+        Run the simulation kernel for one parameter set.
+        
+        Returns:
+            (capital, inventory by base, orders, trades, trade pnl array, equity_curve)
+        """
+        present = aligned.present
+        buy_prices = np.zeros(present.shape)
+        sell_prices = np.zeros(present.shape)
+        quantities = np.zeros(present.shape)
+        for m, market in enumerate(aligned.markets):
+            found, idx = present[m], aligned.candle_idx[m]
+            buy, sell, qty = self._quote_arrays(self.candles[market], spread, target_value, min_spread_ticks)
+            buy_prices[m, found] = buy[idx]
+            sell_prices[m, found] = sell[idx]
+            quantities[m, found] = qty[idx]
+        
+        (capital, inventory, equity_curve, order_market, order_side, order_price,
+         order_qty, order_ts, order_filled, order_fill_ts, n_orders, trade_orders,
+         n_trades) = _simulate_kernel(
+            aligned.timeline, present, aligned.lows, aligned.highs, buy_prices, sell_prices,
+            quantities, aligned.market_base, aligned.base_marks, float(self.initial_capital)
+        )
+        
+        # Rebuild the Python-side order book once
+        markets = aligned.markets
+        sides = ('buy', 'sell')
+        fill_prices = np.where(order_filled[:n_orders], order_price[:n_orders], 0.0)
+        orders = [
+            SimulatedOrder(id=o + 1, market=markets[m], side=sides[side], price=price,
+                           quantity=qty, timestamp=ts, filled=filled,
+                           fill_price=fill_price, fill_timestamp=fill_ts)
+            for o, (m, side, price, qty, ts, filled, fill_price, fill_ts) in enumerate(zip(
+                order_market[:n_orders].tolist(), order_side[:n_orders].tolist(),
+                order_price[:n_orders].tolist(), order_qty[:n_orders].tolist(),
+                order_ts[:n_orders].tolist(), order_filled[:n_orders].tolist(),
+                fill_prices.tolist(), order_fill_ts[:n_orders].tolist()
+            ))
+        ]
+        
+        # Trade log as parallel arrays, materialized into dicts in one pass
+        fills = trade_orders[:n_trades]
+        trade_price = order_price[fills]
+        trade_qty = order_qty[fills]
+        trade_value = trade_price * trade_qty
+        trade_side = order_side[fills]
+        trade_pnl = np.where(trade_side == SIDE_SELL, trade_value, -trade_value)
+        trades = [
+            {
+                'order_id': o + 1,
+                'market': markets[m],
+                'side': sides[side],
+                'price': price,
+                'quantity': qty,
+                'value': value,
+                'timestamp': ts,
+                'pnl': pnl
+            }
+            for o, m, side, price, qty, value, ts, pnl in zip(
+                fills.tolist(), order_market[fills].tolist(), trade_side.tolist(),
+                trade_price.tolist(), trade_qty.tolist(), trade_value.tolist(),
+                order_fill_ts[fills].tolist(), trade_pnl.tolist()
+            )
+        ]
+        
+        inventory_by_base = {base: float(inventory[b]) for b, base in enumerate(aligned.bases)}
+        return float(capital), inventory_by_base, orders, trades, trade_pnl, equity_curve
+    
+    def _build_result(self, aligned: _AlignedCandles, capital: float,
+                      inventory: Dict[str, float], trades: List[Dict],
+                      trade_pnl: np.ndarray, equity_curve: np.ndarray) -> BacktestResult:
+        """Compute performance metrics for one simulation."""
+        # Max drawdown from the running equity peak
+        peaks = np.maximum.accumulate(equity_curve)
+        drawdowns = np.where(peaks > 0, (peaks - equity_curve) / np.where(peaks > 0, peaks, 1), 0.0)
+        max_drawdown = float(drawdowns.max())
         
         # Calculate final metrics
-        winning = sum(1 for t in self.trades if t.get('pnl', 0) > 0)
-        losing = sum(1 for t in self.trades if t.get('pnl', 0) < 0)
-        total_pnl = sum(t.get('pnl', 0) for t in self.trades)
-        
-        # Simple Sharpe approximation
-        if len(equity_curve) > 1:
-            returns = [(equity_curve[i] - equity_curve[i-1]) / equity_curve[i-1] 
-                      for i in range(1, len(equity_curve)) if equity_curve[i-1] > 0]
-            if returns:
-                import statistics
-                avg_return = statistics.mean(returns)
-                std_return = statistics.stdev(returns) if len(returns) > 1 else 1
-                sharpe = avg_return / std_return * (len(returns) ** 0.5) if std_return > 0 else 0
-            else:
-                sharpe = 0
+        winning = int(np.count_nonzero(trade_pnl > 0))
+        losing = int(np.count_nonzero(trade_pnl < 0))
+        total_pnl = float(trade_pnl.sum())
+        
+        # Simple Sharpe approximation over step returns with a positive prior equity
+        prev = equity_curve[:-1]
+        valid = prev > 0
+        returns = (equity_curve[1:][valid] - prev[valid]) / prev[valid]
+        if returns.size:
+            avg_return = returns.mean()
+            std_return = returns.std(ddof=1) if returns.size > 1 else 1.0
+            sharpe = float(avg_return / std_return * np.sqrt(returns.size)) if std_return > 0 else 0
         else:
             sharpe = 0
         
         return BacktestResult(
-            start_time=start_time,
-            end_time=end_time,
+            start_time=float(aligned.timeline[0]),
+            end_time=float(aligned.timeline[-1]),
             initial_capital=self.initial_capital,
-            final_capital=self.capital + sum(self.inventory.values()),  # Simplified
-            total_trades=len(self.trades),
+            final_capital=capital + sum(inventory.values()),  # Simplified
+            total_trades=len(trades),
             winning_trades=winning,
             losing_trades=losing,
             total_pnl=total_pnl,
             max_drawdown=max_drawdown,
             sharpe_ratio=sharpe,
             markets_traded=list(self.candles.keys()),
-            trades=self.trades
+            trades=trades
         )
     
     def _place_order(self, market: str, side: str, price: float, 
@@ -312,30 +636,6 @@ class BacktestEngine:
         )
         self.orders.append(order)
     
-    def _process_fill(self, order: SimulatedOrder):
-        """Process a filled order."""
-        base = order.market.split('_')[0]
-        value = order.fill_price * order.quantity
-        
-        if order.side == 'buy':
-            self.capital -= value
-            self.inventory[base] += order.quantity
-        else:
-            self.capital += value
-            self.inventory[base] -= order.quantity
-        
-        # Record trade
-        self.trades.append({
-            'order_id': order.id,
-            'market': order.market,
-            'side': order.side,
-            'price': order.fill_price,
-            'quantity': order.quantity,
-            'value': value,
-            'timestamp': order.fill_timestamp,
-            'pnl': value if order.side == 'sell' else -value
-        })
-    
     def _empty_result(self) -> BacktestResult:
         """Return empty result for failed backtest."""
         return BacktestResult(
@@ -2,7 +2,6 @@ import asyncio
 import os
 import sys
 import logging
-from typing import List
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -18,6 +17,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger("cleaner")
 
+OPEN_STATUSES = ["open", "pending", "new"]
+CANCEL_WORKERS = 20  # Concurrent cancel requests in flight
+_END_OF_ORDERS = object()  # Queue sentinel, distinct from any order ID
+
+async def produce_order_ids(client: AsyncBlocky, queue: asyncio.Queue) -> int:
+    """Page through open orders, queueing each ID as soon as its page arrives."""
+    found = 0
+    cursor = None
+    try:
+        while True:
+            response = await client.get_orders(
+                statuses=OPEN_STATUSES, 
+                limit=100, 
+                cursor=cursor
+            )
+            
+            if not response.get("success"):
+                logger.error(f"Failed to fetch orders: {response}")
+                break
+            
+            for order in response.get("orders", []):
+                # Skip already cancelled ones just in case API returns them
+                if order.get("status") in OPEN_STATUSES:
+                    await queue.put(order.get("id") or order.get("order_id"))
+                    found += 1
+            
+            cursor = response.get("next_cursor")
+            if not cursor:
+                break
+    finally:
+        await queue.put(_END_OF_ORDERS)
+    return found
+
+async def consume_order_ids(client: AsyncBlocky, queue: asyncio.Queue, cancelled_so_far: int) -> int:
+    """Cancel queued order IDs with a pool of workers while the producer keeps paging."""
+    cancelled = 0
+
+    async def worker():
+        nonlocal cancelled
+        while True:
+            oid = await queue.get()
+            if oid is _END_OF_ORDERS:
+                await queue.put(oid)  # Let the other workers see it too
+                return
+            # The client's rate limiter paces the requests
+            try:
+                await client.cancel_order(oid)
+            except Exception:
+                continue
+            cancelled += 1
+            print(f"\rProgress: {cancelled_so_far + cancelled} orders cancelled...", end="")
+
+    await asyncio.gather(*(worker() for _ in range(CANCEL_WORKERS)))
+    return cancelled
+
 async def clean_orders():
     try:
         config = get_config()
@@ -27,7 +81,8 @@ async def clean_orders():
 
     client = AsyncBlocky(
         api_key=config.api.api_key,
-        endpoint=config.api.endpoint
+        endpoint=config.api.endpoint,
+        rate_limit=config.rate_limit.max_requests
     )
 
     logger.info("🔪 Starting Order Cleanup Tool...")
@@ -37,59 +92,21 @@ async def clean_orders():
     
     try:
         while True:
-            # 1. Fetch all open orders
-            logger.info("Fetching open orders...")
-            all_orders = []
-            cursor = None
+            # Fetch pages and cancel batches concurrently
+            logger.info("Fetching and cancelling open orders...")
+            queue: asyncio.Queue = asyncio.Queue()
+            found, cancelled = await asyncio.gather(
+                produce_order_ids(client, queue),
+                consume_order_ids(client, queue, total_cancelled)
+            )
+            total_cancelled += cancelled
             
-            while True:
-                response = await client.get_orders(
-                    statuses=["open", "pending", "new"], 
-                    limit=100, 
-                    cursor=cursor
-                )
-                
-                if not response.get("success"):
-                    logger.error(f"Failed to fetch orders: {response}")
-                    break
-                
-                page_orders = response.get("orders", [])
-                # Filter out already cancelled ones just in case API returns them
-                page_orders = [o for o in page_orders if o.get("status") in ["open", "pending", "new"]]
-                
-                all_orders.extend(page_orders)
-                
-                cursor = response.get("next_cursor")
-                if not cursor:
-                    break
-            
-            if not all_orders:
+            if not found:
                 logger.info("✅ No open orders found! Cleanup complete.")
                 break
-                
-            logger.info(f"Found {len(all_orders)} open orders. Cancelling...")
-            
-            # 2. Cancel in batches
-            batch_size = 20 # Rate limit safe batch
-            for i in range(0, len(all_orders), batch_size):
-                batch = all_orders[i:i+batch_size]
-                tasks = []
-                for order in batch:
-                    oid = order.get("id") or order.get("order_id")
-                    tasks.append(client.cancel_order(oid))
-                
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Count success
-                for res in results:
-                    if not isinstance(res, Exception):
-                        total_cancelled += 1
-                
-                print(f"\rProgress: {total_cancelled} orders cancelled...", end="")
-                await asyncio.sleep(0.5) # Rate limit checking mechanism
             
             print("") # Newline
-            logger.info("Batch complete. Re-checking...")
+            logger.info(f"Processed {found} open orders. Re-checking...")
             await asyncio.sleep(1)
 
     except KeyboardInterrupt:
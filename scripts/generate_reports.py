@@ -11,17 +11,21 @@ Usage:
 """
 
 import os
+import mmap
 import sys
 import json
-import glob
 import argparse
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Any, Optional
+from collections import Counter, defaultdict
+from typing import Dict, List, Any, Optional, Tuple
 
-# Add parent dir to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -30,6 +34,30 @@ REPORTS_DIR = DATA_DIR / "reports"
 LOGS_DIR = PROJECT_ROOT / "logs"
 METRICS_FILE = PROJECT_ROOT / "src" / "metrics_data.json"
 
+# Bytes searched beyond a date's bisected range in the JSONL data files and
+# bot.log; date lines further out of order than this are not read
+TS_WINDOW_SLACK = 64 * 1024
+
+
+def json_loads(data):
+    """Decode JSON text or bytes, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # Let the stdlib decide (it also accepts NaN/Infinity)
+    return json.loads(data)
+
+
+def json_dumps_indented(obj) -> str:
+    """Encode obj as 2-space indented JSON, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        except orjson.JSONEncodeError:
+            pass  # e.g. ints beyond 64 bits; the stdlib handles those
+    return json.dumps(obj, indent=2)
+
 
 def ensure_dirs():
     """Create necessary directories."""
@@ -41,53 +69,152 @@ def ensure_dirs():
 def load_metrics() -> Dict[str, Any]:
     """Load metrics from the bot's metrics file."""
     if METRICS_FILE.exists():
-        with open(METRICS_FILE, 'r') as f:
-            return json.load(f)
+        with open(METRICS_FILE, 'rb') as f:
+            return json_loads(f.read())
     return {}
 
 
+def _iter_lines_containing(path: Path, needle: bytes, window=None):
+    """
+    Yield the lines of a file (as bytes, without the newline) that contain needle.
+    
+    The file is memory-mapped and searched for needle directly, so lines that
+    don't contain it are skipped in C instead of being visited one by one.
+    If given, window(mm) returns the (start, end) byte range to search.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap can't map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lo, hi = window(mm) if window else (0, len(mm))
+            pos = mm.find(needle, lo, hi)
+            while pos != -1:
+                start = mm.rfind(b"\n", 0, pos) + 1
+                end = mm.find(b"\n", pos)
+                if end == -1:
+                    end = len(mm)
+                yield mm[start:end]
+                pos = mm.find(needle, end, hi)
+
+
+def _line_ts_prefix(mm: mmap.mmap, start: int, size: int) -> Tuple[Optional[bytes], int]:
+    """Return the first size bytes of the "ts" value of the line at start, and the line end."""
+    end = mm.find(b"\n", start)
+    if end == -1:
+        end = len(mm)
+    key = mm.find(b'"ts"', start, end)
+    if key == -1:
+        return None, end
+    quote = mm.find(b'"', key + 4, end)  # Opening quote of the value
+    if quote == -1:
+        return None, end
+    return mm[quote + 1:quote + 1 + size], end
+
+
+def _line_log_prefix(mm: mmap.mmap, start: int, size: int) -> Tuple[Optional[bytes], int]:
+    """Return the first size bytes of the asctime of the log line at start, and the line end."""
+    end = mm.find(b"\n", start)
+    if end == -1:
+        end = len(mm)
+    # Continuation lines (tracebacks etc.) don't start with a date
+    if end - start < 10 or not mm[start:start + 4].isdigit() or mm[start + 4] != ord("-"):
+        return None, end
+    return mm[start:start + size], end
+
+
+def _bisect_ts(mm: mmap.mmap, prefix: bytes, right: bool = False,
+               line_key=_line_ts_prefix) -> int:
+    """
+    Byte offset of the first line whose ts prefix is >= prefix (> prefix if right).
+    
+    Assumes lines are in ts order; lines where line_key finds no ts are skipped.
+    """
+    size = len(prefix)
+    lo, hi = 0, len(mm)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        nl = mm.find(b"\n", mid - 1) if mid else -1
+        start = 0 if not mid else (nl + 1 if nl != -1 else len(mm))
+        key = None
+        while start < hi:
+            key, end = line_key(mm, start, size)
+            if key is not None:
+                break
+            start = end + 1
+        if key is None:
+            hi = mid
+        elif key < prefix or (right and key == prefix):
+            lo = end + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _ts_window(mm: mmap.mmap, prefix: bytes, line_key=_line_ts_prefix) -> Tuple[int, int]:
+    """Byte range of a ts-ordered map holding the records whose ts starts with prefix."""
+    # Pad both ends so slightly out-of-order appends near the edges aren't lost
+    return (max(0, _bisect_ts(mm, prefix, line_key=line_key) - TS_WINDOW_SLACK),
+            min(len(mm), _bisect_ts(mm, prefix, right=True, line_key=line_key) + TS_WINDOW_SLACK))
+
+
+def _list_market_files(prefix: str) -> List[Tuple[str, Path]]:
+    """List (market, path) for DATA_DIR/<prefix>_<market>.jsonl in one scandir pass."""
+    head, tail = f"{prefix}_", ".jsonl"
+    try:
+        with os.scandir(DATA_DIR) as entries:
+            return [
+                (entry.name[:-len(tail)].replace(head, ""), Path(entry.path))
+                for entry in entries
+                if entry.name.startswith(head) and entry.name.endswith(tail) and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def _iter_dated_records(prefix: str, date_str: str):
+    """Yield (market, record) for a specific date from DATA_DIR/<prefix>_<market>.jsonl files."""
+    date_bytes = date_str.encode()
+    # Records are appended in time order, so only the date's byte range is
+    # searched, and only lines mentioning the date are decoded
+    window = partial(_ts_window, prefix=date_bytes)
+    
+    for market, filepath in _list_market_files(prefix):
+        for line in _iter_lines_containing(filepath, date_bytes, window):
+            try:
+                data = json_loads(line)
+            except ValueError:  # JSONDecodeError or undecodable bytes
+                continue
+            ts = data.get("ts", "")
+            if ts.startswith(date_str):
+                yield market, data
+
+
+def _parse_dated_jsonl(prefix: str, date_str: str) -> Dict[str, List[Dict]]:
+    """Parse the records for a specific date from DATA_DIR/<prefix>_<market>.jsonl files."""
+    records = defaultdict(list)
+    for market, data in _iter_dated_records(prefix, date_str):
+        records[market].append(data)
+    return dict(records)
+
+
 def parse_snapshots(date_str: str) -> Dict[str, List[Dict]]:
     """Parse snapshot files for a specific date."""
-    snapshots = defaultdict(list)
-    
-    for filepath in DATA_DIR.glob("snapshot_*.jsonl"):
-        market = filepath.stem.replace("snapshot_", "")
-        
-        with open(filepath, 'r') as f:
-            for line in f:
-                try:
-                    data = json.loads(line)
-                    ts = data.get("ts", "")
-                    if ts.startswith(date_str):
-                        snapshots[market].append(data)
-                except json.JSONDecodeError:
-                    continue
-    
-    return dict(snapshots)
+    return _parse_dated_jsonl("snapshot", date_str)
 
 
 def parse_orderbooks(date_str: str) -> Dict[str, List[Dict]]:
     """Parse orderbook files for a specific date."""
-    orderbooks = defaultdict(list)
-    
-    for filepath in DATA_DIR.glob("orderbook_*.jsonl"):
-        market = filepath.stem.replace("orderbook_", "")
-        
-        with open(filepath, 'r') as f:
-            for line in f:
-                try:
-                    data = json.loads(line)
-                    ts = data.get("ts", "")
-                    if ts.startswith(date_str):
-                        orderbooks[market].append(data)
-                except json.JSONDecodeError:
-                    continue
-    
-    return dict(orderbooks)
+    return _parse_dated_jsonl("orderbook", date_str)
 
 
 def parse_log_file(date_str: str) -> Dict[str, Any]:
-    """Parse bot log file for insights."""
+    """
+    Parse bot log file for insights.
+    
+    Only the byte range bisected for the date (padded by TS_WINDOW_SLACK) is
+    scanned. A line that mentions the date but sits further outside that
+    range, e.g. one written out of timestamp order, is not counted.
+    """
     log_file = LOGS_DIR / "bot.log"
     
     stats = {
@@ -102,62 +229,102 @@ def parse_log_file(date_str: str) -> Dict[str, Any]:
     if not log_file.exists():
         return stats
     
-    with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            if date_str not in line:
-                continue
-            
-            if "Placed buy order" in line or "Placed sell order" in line:
-                stats["orders_placed"] += 1
-                # Extract market name
-                parts = line.split("│")
-                if len(parts) >= 3:
-                    market = parts[2].strip().split(":")[0]
-                    stats["markets_active"].add(market)
-            
-            elif "Cancelling order" in line:
-                stats["orders_cancelled"] += 1
-            
-            elif "ERROR" in line:
-                stats["errors"].append(line.strip()[-200:])  # Last 200 chars
-            
-            elif "WARNING" in line:
-                stats["warnings"].append(line.strip()[-200:])
-            
-            elif "Integrity Check" in line:
-                stats["integrity_checks"] += 1
+    # bot.log is append-only, so today's entries sit in one contiguous byte range
+    date_bytes = date_str.encode()
+    window = partial(_ts_window, prefix=date_bytes, line_key=_line_log_prefix)
+    for raw_line in _iter_lines_containing(log_file, date_bytes, window):
+        line = raw_line.decode('utf-8', errors='ignore')
+        
+        if "Placed buy order" in line or "Placed sell order" in line:
+            stats["orders_placed"] += 1
+            # Extract market name
+            parts = line.split("│")
+            if len(parts) >= 3:
+                market = parts[2].strip().split(":")[0]
+                stats["markets_active"].add(market)
+        
+        elif "Cancelling order" in line:
+            stats["orders_cancelled"] += 1
+        
+        elif "ERROR" in line:
+            stats["errors"].append(line.strip()[-200:])  # Last 200 chars
+        
+        elif "WARNING" in line:
+            stats["warnings"].append(line.strip()[-200:])
+        
+        elif "Integrity Check" in line:
+            stats["integrity_checks"] += 1
     
     stats["markets_active"] = list(stats["markets_active"])
     return stats
 
 
-def analyze_market_performance(snapshots: Dict[str, List[Dict]]) -> Dict[str, Dict]:
-    """Analyze performance per market from snapshots."""
+def stream_market_stats(date_str: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Accumulate per-market snapshot statistics for a date in a single pass.
+    
+    Snapshots are folded into running counters as they are decoded instead of
+    being kept in memory, so peak memory is per market rather than per snapshot.
+    """
+    stats = {}
+    
+    for market, snap in _iter_dated_records("snapshot", date_str):
+        st = stats.get(market)
+        if st is None:
+            st = stats[market] = {
+                "samples": 0, "mid_count": 0, "mid_sum": 0, "mid_min": None, "mid_max": None,
+                "buy_active": 0, "sell_active": 0, "sell_inactive": 0,
+            }
+        st["samples"] += 1
+        
+        data = snap.get("data")
+        if data is None:
+            continue
+        
+        mid = data.get("mid_price", 0)
+        st["mid_count"] += 1
+        st["mid_sum"] += mid
+        if st["mid_min"] is None or mid < st["mid_min"]:
+            st["mid_min"] = mid
+        if st["mid_max"] is None or mid > st["mid_max"]:
+            st["mid_max"] = mid
+        
+        if data.get("buy_active", False):
+            st["buy_active"] += 1
+        # A missing sell_active flag counts as neither active nor inactive
+        if "sell_active" in data:
+            if data["sell_active"]:
+                st["sell_active"] += 1
+            else:
+                st["sell_inactive"] += 1
+    
+    return stats
+
+
+def analyze_market_performance(market_stats: Dict[str, Dict[str, Any]]) -> Dict[str, Dict]:
+    """Analyze performance per market from streamed snapshot statistics."""
     performance = {}
     
-    for market, snaps in snapshots.items():
-        if not snaps:
+    for market, st in market_stats.items():
+        if not st["mid_count"]:
             continue
         
-        mid_prices = [s["data"].get("mid_price", 0) for s in snaps if "data" in s]
-        buy_active = sum(1 for s in snaps if s.get("data", {}).get("buy_active", False))
-        sell_active = sum(1 for s in snaps if s.get("data", {}).get("sell_active", False))
-        
-        if mid_prices:
-            performance[market] = {
-                "avg_mid_price": sum(mid_prices) / len(mid_prices),
-                "min_price": min(mid_prices),
-                "max_price": max(mid_prices),
-                "price_volatility": (max(mid_prices) - min(mid_prices)) / max(mid_prices) * 100 if max(mid_prices) > 0 else 0,
-                "buy_active_pct": buy_active / len(snaps) * 100,
-                "sell_active_pct": sell_active / len(snaps) * 100,
-                "samples": len(snaps),
-            }
+        samples = st["samples"]
+        min_price, max_price = st["mid_min"], st["mid_max"]
+        performance[market] = {
+            "avg_mid_price": st["mid_sum"] / st["mid_count"],
+            "min_price": min_price,
+            "max_price": max_price,
+            "price_volatility": (max_price - min_price) / max_price * 100 if max_price > 0 else 0,
+            "buy_active_pct": st["buy_active"] / samples * 100,
+            "sell_active_pct": st["sell_active"] / samples * 100,
+            "samples": samples,
+        }
     
     return performance
 
 
-def detect_anomalies(log_stats: Dict, snapshots: Dict) -> List[str]:
+def detect_anomalies(log_stats: Dict, market_stats: Dict[str, Dict[str, Any]]) -> List[str]:
     """Detect anomalies worth mentioning to LLM."""
     anomalies = []
     
@@ -168,21 +335,19 @@ def detect_anomalies(log_stats: Dict, snapshots: Dict) -> List[str]:
             anomalies.append(f"High cancellation rate: {cancel_rate:.1f}x orders cancelled vs placed")
     
     # Markets with low activity
-    for market, snaps in snapshots.items():
-        if len(snaps) < 5:
-            anomalies.append(f"{market}: Very few snapshots ({len(snaps)}), possible connectivity issue")
+    for market, st in market_stats.items():
+        samples = st["samples"]
+        if samples < 5:
+            anomalies.append(f"{market}: Very few snapshots ({samples}), possible connectivity issue")
         
         # Check for constant sell_active=false (inventory issue)
-        sell_inactive = sum(1 for s in snaps if not s.get("data", {}).get("sell_active", True))
-        if sell_inactive > len(snaps) * 0.8 and len(snaps) > 5:
-            anomalies.append(f"{market}: sell_active=false {sell_inactive}/{len(snaps)} times (no inventory?)")
+        sell_inactive = st["sell_inactive"]
+        if sell_inactive > samples * 0.8 and samples > 5:
+            anomalies.append(f"{market}: sell_active=false {sell_inactive}/{samples} times (no inventory?)")
     
     # Error patterns
-    error_counts = defaultdict(int)
-    for err in log_stats.get("errors", []):
-        # Simplify error message to group similar ones
-        key = err[:50] if len(err) > 50 else err
-        error_counts[key] += 1
+    # Group similar errors by their first 50 chars (Counter tallies in C)
+    error_counts = Counter(err[:50] for err in log_stats.get("errors", []))
     
     for err, count in error_counts.items():
         if count > 5:
@@ -196,11 +361,10 @@ def generate_daily_report(date_str: str) -> str:
     
     # Gather data
     metrics = load_metrics()
-    snapshots = parse_snapshots(date_str)
-    orderbooks = parse_orderbooks(date_str)
+    market_stats = stream_market_stats(date_str)
     log_stats = parse_log_file(date_str)
-    market_perf = analyze_market_performance(snapshots)
-    anomalies = detect_anomalies(log_stats, snapshots)
+    market_perf = analyze_market_performance(market_stats)
+    anomalies = detect_anomalies(log_stats, market_stats)
     
     # Build report
     report = []
@@ -209,7 +373,7 @@ def generate_daily_report(date_str: str) -> str:
     
     # Executive Summary
     report.append("## Executive Summary\n")
-    report.append(f"- **Markets Monitored**: {len(snapshots)}")
+    report.append(f"- **Markets Monitored**: {len(market_stats)}")
     report.append(f"- **Orders Placed**: {log_stats['orders_placed']}")
     report.append(f"- **Orders Cancelled**: {log_stats['orders_cancelled']}")
     report.append(f"- **Integrity Checks**: {log_stats['integrity_checks']}")
@@ -282,10 +446,10 @@ def generate_daily_report(date_str: str) -> str:
         "orders_placed": log_stats["orders_placed"],
         "orders_cancelled": log_stats["orders_cancelled"],
         "realized_pnl": metrics.get("realized_pnl", 0),
-        "active_markets": len(snapshots),
+        "active_markets": len(market_stats),
         "top_volatile": [m for m, p in sorted_markets[:5]] if market_perf else [],
     }
-    report.append(json.dumps(summary, indent=2))
+    report.append(json_dumps_indented(summary))
     report.append("```\n")
     
     return "\n".join(report)
@@ -296,14 +460,17 @@ def generate_weekly_report(end_date: str) -> str:
     end = datetime.strptime(end_date, "%Y-%m-%d")
     start = end - timedelta(days=7)
     
+    # Format the week's dates once up front
+    dates = [start + timedelta(days=i) for i in range(7)]
+    date_strs = [f"{d.year:04d}-{d.month:02d}-{d.day:02d}" for d in dates]
+    
     report = []
-    report.append(f"# Weekly Report: {start.strftime('%Y-%m-%d')} to {end_date}\n")
+    report.append(f"# Weekly Report: {date_strs[0]} to {end_date}\n")
     report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
     # Aggregate daily reports
     daily_summaries = []
-    for i in range(7):
-        date = (start + timedelta(days=i)).strftime("%Y-%m-%d")
+    for date in date_strs:
         daily_file = REPORTS_DIR / "daily" / f"{date}.md"
         
         if daily_file.exists():
@@ -355,8 +522,8 @@ def main():
         report = generate_daily_report(date_str)
         output_file = REPORTS_DIR / "daily" / f"{date_str}.md"
     
-    with open(output_file, 'w') as f:
-        f.write(report)
+    # Encode once and write bytes, skipping the text-mode encoder/newline layer
+    output_file.write_bytes(report.encode('utf-8'))
     
     print(f"Report generated: {output_file}")
     print("\n--- Preview ---\n")
@@ -1,16 +1,28 @@
 from blocky import Blocky
 
 API_ENDPOINT = "https://craft.blocky.com.br/api/v1"
-client = Blocky(endpoint=API_ENDPOINT)
 
-print(f"Fetching markets from {API_ENDPOINT}...")
-try:
-    response = client.get_markets()
-    if response.get("success"):
-        print("\nAvailable Markets:")
-        for market in response.get("markets", []):
-            print(f"- {market['market']} (Base: {market.get('base_instrument')}, Quote: {market.get('quote_instrument')})")
-    else:
-        print("Failed to fetch markets:", response)
-except Exception as e:
-    print(f"Error: {e}")
+
+def main():
+    client = Blocky(endpoint=API_ENDPOINT)
+
+    print(f"Fetching markets from {API_ENDPOINT}...")
+    try:
+        response = client.get_markets()
+        if response.get("success"):
+            print("\nAvailable Markets:")
+            markets = response.get("markets", ())
+            if markets:
+                # Format every row first and write them out in one print
+                print("\n".join(
+                    f"- {market['market']} (Base: {market.get('base_instrument')}, Quote: {market.get('quote_instrument')})"
+                    for market in markets
+                ))
+        else:
+            print("Failed to fetch markets:", response)
+    except Exception as e:
+        print(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
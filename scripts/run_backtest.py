@@ -18,7 +18,6 @@ from dotenv import load_dotenv
 load_dotenv(override=True)
 
 from blocky import Blocky
-from backtest import BacktestEngine
 from config import get_config
 
 # Configure logging
@@ -29,6 +28,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Markets tested when neither --markets nor --all-markets is given
+DEFAULT_MARKETS = ('diam_iron', 'gold_iron', 'coal_iron', 'lapi_iron', 'ston_iron')
+
 
 def parse_args():
     """Parse command line arguments."""
@@ -103,7 +105,7 @@ def get_available_markets(client) -> list:
     try:
         response = client.get_markets()
         if response.get('success'):
-            return [m['market'] for m in response.get('markets', [])]
+            return [m['market'] for m in response.get('markets', ())]
     except Exception as e:
         logger.error(f"Failed to fetch markets: {e}")
     return []
@@ -143,13 +145,15 @@ def main():
     elif args.markets:
         markets = args.markets
     else:
-        # Default markets
-        markets = ['diam_iron', 'gold_iron', 'coal_iron', 'lapi_iron', 'ston_iron']
+        markets = DEFAULT_MARKETS
     
     print(f"📈 Markets: {', '.join(markets)}")
     print(f"💰 Initial Capital: {args.capital} Iron")
     print(f"⏰ Timeframe: {args.timeframe}")
     
+    # Imported here so --help and argument errors don't pay for NumPy/Numba start-up
+    from backtest import BacktestEngine
+    
     # Create backtest engine
     engine = BacktestEngine(initial_capital=args.capital)
     
@@ -157,13 +161,16 @@ def main():
     print("-" * 40)
     print("📥 Fetching historical data...")
     
+    # Keep only the counts; the engine holds its own columnar copy of the candles,
+    # so the raw API dicts can be freed before the simulation runs
+    candle_counts = [len(c) for c in engine.fetch_candles_many(client, markets, args.timeframe)]
+    
     loaded_markets = 0
-    for market in markets:
-        candles = engine.fetch_candles_from_api(client, market, args.timeframe)
-        if candles:
+    for market, count in zip(markets, candle_counts):
+        if count:
             loaded_markets += 1
             if not args.quiet:
-                print(f"   ✓ {market}: {len(candles)} candles")
+                print(f"   ✓ {market}: {count} candles")
         else:
             if not args.quiet:
                 print(f"   ✗ {market}: No data available")
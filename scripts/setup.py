@@ -177,8 +177,20 @@ ALERT_WEBHOOK_TYPE=discord
 # BLOCKY_API_ENDPOINT=https://craft.blocky.com.br/api/v1
 """
     
-    with open(ENV_FILE, 'w') as f:
-        f.write(content)
+    # Write to a temp file and swap it in, so a crash can't leave a truncated .env
+    # Owner-only permissions: the file holds the API key
+    tmp_file = ENV_FILE + ".tmp"
+    try:
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content.encode('utf-8'))
+        os.replace(tmp_file, ENV_FILE)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
 
 
 def check_existing_env() -> bool:
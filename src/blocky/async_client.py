@@ -3,15 +3,57 @@ Async HTTP client for the Blocky API using aiohttp.
 Provides the same interface as the sync client but without blocking.
 """
 import asyncio
+import json
 import logging
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Coroutine
 from enum import Enum
+from collections import deque
 import aiohttp
 
+# Try to import orjson for faster response decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import uvloop for a faster event loop (not available on Windows)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Try to import aiodns so host lookups resolve on the event loop
+try:
+    import aiodns  # noqa: F401 - used by aiohttp.AsyncResolver
+    AIODNS_AVAILABLE = True
+except ImportError:
+    AIODNS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def _decode_json(body: bytes) -> Any:
+    """Decode a JSON response body (None if empty), with orjson when available."""
+    if not body.strip():
+        return None
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass  # Let the stdlib decide (it also accepts NaN/Infinity and UTF-16/32)
+    return json.loads(body)
+
+
+def _encode_json(obj: Any) -> str:
+    """Encode a request body as JSON, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
 class CircuitBreakerState(Enum):
     """Circuit breaker states."""
     CLOSED = 0
@@ -25,29 +67,33 @@ class AsyncRateLimiter:
     def __init__(self, max_requests: int = 30, window_seconds: float = 1.0):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.timestamps: List[float] = []
+        self.timestamps: deque = deque()
         self._lock = asyncio.Lock()
     
     async def acquire(self) -> None:
         """Wait until a request slot is available."""
-        async with self._lock:
-            now = time.time()
-            
-            # Remove old timestamps
-            cutoff = now - self.window_seconds
-            self.timestamps = [t for t in self.timestamps if t > cutoff]
-            
-            # Wait if at limit
-            if len(self.timestamps) >= self.max_requests:
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                
+                # Remove old timestamps (they're in order, so only from the left)
+                cutoff = now - self.window_seconds
+                while self.timestamps and self.timestamps[0] <= cutoff:
+                    self.timestamps.popleft()
+                
+                if len(self.timestamps) < self.max_requests:
+                    self.timestamps.append(now)
+                    return
+                
+                # At limit: wait for the oldest request to leave the window
                 sleep_time = self.timestamps[0] - cutoff
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
             
-            self.timestamps.append(time.time())
+            # Sleep outside the lock so other callers aren't queued behind us
+            await asyncio.sleep(sleep_time)
     
     def get_stats(self) -> dict:
         """Returns rate limiter statistics."""
-        now = time.time()
+        now = time.monotonic()
         cutoff = now - self.window_seconds
         current_count = len([t for t in self.timestamps if t > cutoff])
         return {
@@ -80,14 +126,16 @@ class AsyncCircuitBreaker:
     
     async def call(self, func, *args, **kwargs):
         """Execute function with circuit breaker protection."""
-        async with self._lock:
-            if self.state == CircuitBreakerState.OPEN:
-                if time.time() - self.last_failure_time >= self.recovery_timeout:
-                    self.state = CircuitBreakerState.HALF_OPEN
-                    self.half_open_calls = 0
-                    logger.info("Circuit breaker: HALF_OPEN")
-                else:
-                    raise CircuitBreakerOpen("Circuit breaker is open")
+        # CLOSED and HALF_OPEN pass straight through; only OPEN needs the lock
+        if self.state == CircuitBreakerState.OPEN:
+            async with self._lock:
+                if self.state == CircuitBreakerState.OPEN:
+                    if time.monotonic() - self.last_failure_time >= self.recovery_timeout:
+                        self.state = CircuitBreakerState.HALF_OPEN
+                        self.half_open_calls = 0
+                        logger.info("Circuit breaker: HALF_OPEN")
+                    else:
+                        raise CircuitBreakerOpen("Circuit breaker is open")
         
         try:
             result = await func(*args, **kwargs)
@@ -100,25 +148,25 @@ class AsyncCircuitBreaker:
             await self._on_failure()
             raise
     
+    # The counter updates below contain no await, so on the single event-loop
+    # thread they run atomically without taking the lock
     async def _on_success(self) -> None:
-        async with self._lock:
-            if self.state == CircuitBreakerState.HALF_OPEN:
-                self.half_open_calls += 1
-                if self.half_open_calls >= self.half_open_max_calls:
-                    self.state = CircuitBreakerState.CLOSED
-                    self.failure_count = 0
-                    logger.info("Circuit breaker: CLOSED (recovered)")
-            else:
+        if self.state == CircuitBreakerState.HALF_OPEN:
+            self.half_open_calls += 1
+            if self.half_open_calls >= self.half_open_max_calls:
+                self.state = CircuitBreakerState.CLOSED
                 self.failure_count = 0
+                logger.info("Circuit breaker: CLOSED (recovered)")
+        else:
+            self.failure_count = 0
     
     async def _on_failure(self) -> None:
-        async with self._lock:
-            self.failure_count += 1
-            self.last_failure_time = time.time()
-            
-            if self.failure_count >= self.failure_threshold:
-                self.state = CircuitBreakerState.OPEN
-                logger.warning("Circuit breaker: OPEN")
+        self.failure_count += 1
+        self.last_failure_time = time.monotonic()
+        
+        if self.failure_count >= self.failure_threshold:
+            self.state = CircuitBreakerState.OPEN
+            logger.warning("Circuit breaker: OPEN")
     
     def get_stats(self) -> dict:
         """Returns circuit breaker statistics."""
@@ -167,11 +215,39 @@ class AsyncBlocky:
         
         self._session: Optional[aiohttp.ClientSession] = None
     
+    @staticmethod
+    def run_fast_loop(main: Coroutine[Any, Any, Any]) -> Any:
+        """
+        Run main to completion like asyncio.run(), on uvloop when it is installed.
+        
+        The loop is picked per run through asyncio.Runner's loop_factory
+        rather than a global event loop policy.
+        """
+        loop_factory = uvloop.new_event_loop if UVLOOP_AVAILABLE else None
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            return runner.run(main)
+    
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
         if self._session is None or self._session.closed:
-            headers = {"X-API-KEY": self.api_key}
-            self._session = aiohttp.ClientSession(headers=headers)
+            # aiohttp already advertises and decodes gzip/deflate (and br when
+            # Brotli is installed); only JSON is ever expected back
+            headers = {"X-API-KEY": self.api_key, "Accept": "application/json"}
+            # Keep idle connections around between polling bursts so calls
+            # reuse them instead of paying a new TCP/TLS handshake
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=32,
+                keepalive_timeout=75.0,
+                ttl_dns_cache=600,
+                # Without aiodns, aiohttp resolves via getaddrinfo on a thread
+                resolver=aiohttp.AsyncResolver() if AIODNS_AVAILABLE else None
+            )
+            timeout = aiohttp.ClientTimeout(total=30, connect=5, sock_read=20)
+            self._session = aiohttp.ClientSession(
+                headers=headers, connector=connector, timeout=timeout,
+                json_serialize=_encode_json
+            )
         return self._session
     
     async def close(self) -> None:
@@ -196,10 +272,10 @@ class AsyncBlocky:
             
             async with session.request(method, url, params=params, json=json) as response:
                 try:
-                    data = await response.json(content_type=None)
-                except:
-                   # Fallback if empty or invalid json
-                   data = {}
+                    data = _decode_json(await response.read())
+                except Exception:
+                    # Fallback if invalid json
+                    data = {}
                 
                 if response.status == 429:
                     raise RateLimitException("Rate limit exceeded")
@@ -229,6 +305,26 @@ class AsyncBlocky:
         """Get orderbook for a market."""
         return await self._request("GET", f"markets/{market}/orderbook")
     
+    async def get_many_orderbooks(self, markets: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get orderbooks for several markets concurrently (failed markets are omitted)."""
+        return await self._gather_per_market(self.get_orderbook, markets)
+    
+    async def _gather_per_market(self, fetch, markets: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run fetch(market) for every market at once.
+        
+        The requests overlap on the shared session and are still paced by the
+        rate limiter. Failures are logged and left out of the result.
+        """
+        results = await asyncio.gather(*(fetch(m) for m in markets), return_exceptions=True)
+        by_market = {}
+        for market, result in zip(markets, results):
+            if isinstance(result, Exception):
+                logger.warning(f"{fetch.__name__} failed for {market}: {result}")
+            else:
+                by_market[market] = result
+        return by_market
+    
     async def get_ohlcv(
         self,
         market: str,
@@ -315,7 +411,7 @@ class AsyncBlocky:
                 if response.status == 404:
                     return {} # Return empty if not found
                     
-                data = await response.json(content_type=None) # Safe decode
+                data = _decode_json(await response.read())
                 if response.status >= 400:
                     # Log but don't raise to breaker
                     logger.warning(f"Metrics API error {response.status}: {data}")
@@ -6,8 +6,8 @@ across multiple markets with reserve management.
 """
 
 import logging
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +21,13 @@ class AllocationConfig:
     min_order_value: float = 0.10     # Minimum order value in Iron
     priority_markets: List[str] = None
     priority_boost: float = 1.5       # 50% more allocation for priority markets
+    _priority_set: FrozenSet[str] = field(default=frozenset(), init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.priority_markets is None:
             self.priority_markets = []
+        # O(1) membership for per-market lookups; the list is fixed after load
+        self._priority_set = frozenset(self.priority_markets)
 
 
 class CapitalAllocator:
@@ -130,7 +133,7 @@ class CapitalAllocator:
             return 0
         
         # Check if priority market
-        if market in self.config.priority_markets:
+        if market in self.config._priority_set:
             # Boost allocation
             boosted = base_allocation * self.config.priority_boost
             self._last_allocation[market] = boosted
@@ -13,6 +13,8 @@ logger = logging.getLogger(__name__)
 # Try to import PyYAML
 try:
     import yaml
+    # libyaml-backed loader when PyYAML was built with it
+    YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     YAML_AVAILABLE = True
 except ImportError:
     YAML_AVAILABLE = False
@@ -159,6 +161,16 @@ class Config(BaseSettings):
     }
 
 
+# Environment variables that override config values: env var -> (section, field)
+ENV_OVERRIDES = {
+    "BLOCKY_API_KEY": ("api", "api_key"),
+    "BLOCKY_API_ENDPOINT": ("api", "endpoint"),
+    "ALERT_WEBHOOK_URL": ("alerts", "webhook_url"),
+    "ALERT_WEBHOOK_TYPE": ("alerts", "webhook_type"),
+    "LOG_LEVEL": ("logging", "level"),
+}
+
+
 def load_config(config_path: str = "config.yaml") -> Config:
     """
     Load configuration from YAML file with environment variable overrides.
@@ -173,33 +185,24 @@ def load_config(config_path: str = "config.yaml") -> Config:
     # Load from YAML file if available
     if YAML_AVAILABLE and os.path.exists(config_path):
         try:
-            with open(config_path, 'r') as f:
-                yaml_config = yaml.safe_load(f) or {}
+            # Binary mode: libyaml decodes the UTF-8 itself, independent of the locale
+            with open(config_path, 'rb') as f:
+                yaml_config = yaml.load(f, Loader=YamlLoader) or {}
             config_dict = yaml_config
             logger.info(f"📄 Loaded configuration from {config_path}")
         except Exception as e:
             logger.warning(f"Failed to load config from {config_path}: {e}")
     
-    # Create config from YAML dict
-    config = Config(**config_dict)
-    
-    # Apply environment variable overrides
-    if os.environ.get("BLOCKY_API_KEY"):
-        config.api.api_key = os.environ["BLOCKY_API_KEY"]
-    
-    if os.environ.get("BLOCKY_API_ENDPOINT"):
-        config.api.endpoint = os.environ["BLOCKY_API_ENDPOINT"]
-    
-    if os.environ.get("ALERT_WEBHOOK_URL"):
-        config.alerts.webhook_url = os.environ["ALERT_WEBHOOK_URL"]
-    
-    if os.environ.get("ALERT_WEBHOOK_TYPE"):
-        config.alerts.webhook_type = os.environ["ALERT_WEBHOOK_TYPE"]
-    
-    if os.environ.get("LOG_LEVEL"):
-        config.logging.level = os.environ["LOG_LEVEL"]
+    # Overlay environment variable overrides onto the YAML dict
+    for env_var, (section, field) in ENV_OVERRIDES.items():
+        value = os.environ.get(env_var)
+        if value:
+            section_dict = config_dict.get(section) or {}
+            if isinstance(section_dict, dict):
+                config_dict[section] = {**section_dict, field: value}
     
-    return config
+    # Validate everything in a single pass
+    return Config(**config_dict)
 
 
 # Global config instance
@@ -1,7 +1,10 @@
 import asyncio
+import atexit
 import os
+import queue
 import time
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from typing import List, Dict, Optional, Any, Callable, Tuple
 from dotenv import load_dotenv
 
@@ -65,7 +68,18 @@ file_handler.setFormatter(logging.Formatter(
     datefmt='%Y-%m-%d %H:%M:%S'
 ))
 
-logging.basicConfig(level=logging.INFO, handlers=[console_handler, file_handler])
+# Console/file writes happen on a listener thread; the event loop only enqueues records
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, console_handler, file_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Attached directly rather than through basicConfig, which would give the
+# QueueHandler its default format and prefix every message twice
+root_logger = logging.getLogger()
+if not root_logger.handlers:
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(QueueHandler(log_queue))
 logger = logging.getLogger(__name__)
 
 # Configuration - Load from config.yaml with env var overrides
@@ -278,37 +292,22 @@ class MarketMaker:
         As recommended by API developer:
         - Use HTTP for initial state (here)
         - Then WebSocket for real-time updates
+        
+        All markets are requested at once: this runs before any quoting, so
+        the burst can't delay orders. It still goes through the client's
+        rate limiter and shared session.
         """
-        import time
-        from aiohttp import ClientSession
+        orderbooks = await self.client.get_many_orderbooks(self.markets)
         
-        async with ClientSession() as session:
-            tasks = []
-            for market in self.markets:
-                tasks.append(self._fetch_single_orderbook(session, market))
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            success_count = sum(1 for r in results if r is True)
-            logger.info(f"Orderbook cache seeded: {success_count}/{len(self.markets)} markets")
-    
-    async def _fetch_single_orderbook(self, session, market: str) -> bool:
-        """Fetch a single orderbook and cache it."""
-        import time
-        url = f"{self.endpoint}/markets/{market}/orderbook"
-        try:
-            async with session.get(url, timeout=5) as response:
-                if response.status == 200:
-                    data = await response.json(content_type=None)
-                    if data.get("success"):
-                        self.orderbook_cache[market] = {
-                            "orderbook": data.get("orderbook", {}),
-                            "last_update": time.time()
-                        }
-                        return True
-        except Exception as e:
-            logger.debug(f"Failed to fetch orderbook for {market}: {e}")
-        return False
+        success_count = 0
+        for market, data in orderbooks.items():
+            if data.get("success"):
+                self.orderbook_cache[market] = {
+                    "orderbook": data.get("orderbook", {}),
+                    "last_update": time.time()
+                }
+                success_count += 1
+        logger.info(f"Orderbook cache seeded: {success_count}/{len(self.markets)} markets")
 
     async def _fetch_markets(self) -> List[str]:
         """Fetches available markets from the API and applies config filters."""
@@ -909,6 +908,8 @@ class MarketMaker:
                     await asyncio.sleep(5)
                     continue
 
+                # Serial on purpose: a burst here would eat the rate-limiter
+                # window that quoting and cancels need
                 for market in self.markets:
                     try:
                         # Fetch full orderbook
@@ -1078,6 +1079,6 @@ async def main() -> None:
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        AsyncBlocky.run_fast_loop(main())
     except KeyboardInterrupt:
         logger.info("Bot stopped by user.")
@@ -1,7 +1,7 @@
-import requests
+import asyncio
 import logging
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -94,12 +94,23 @@ class PriceModel:
         
         # Cache for metrics
         self._metrics_cache = None
-        self._metrics_cache_time = 0
+        self._metrics_cache_time = 0.0  # time.monotonic() of last refresh
+        self._refresh_lock = asyncio.Lock()  # Single-flight guard for refreshes
         self._cache_ttl = 60 # Seconds
         self._stale_threshold = 300  # 5 minutes - warn if cache older than this
         self._using_stale_cache = False
         self._consecutive_failures = 0
         
+        # Inverse index (metric item id -> markets counting it) so a metrics
+        # snapshot is scattered into market totals in a single pass
+        id_to_markets: Dict[str, List[str]] = {}
+        for market, ids in self.MARKET_MAPPING.items():
+            for item_id in ids:
+                id_to_markets.setdefault(item_id, []).append(market)
+        self._id_to_markets: Dict[str, Tuple[str, ...]] = {
+            item_id: tuple(markets) for item_id, markets in id_to_markets.items()
+        }
+        
         # Initialize estimates for all keys in mapping
         self.world_supply = {}
         for market in self.MARKET_MAPPING:
@@ -129,17 +140,28 @@ class PriceModel:
         total_blocks_area = width * depth
         return int(total_blocks_area / 256)
 
+    def _cache_is_fresh(self) -> bool:
+        """Returns True if the metrics cache is populated and within TTL."""
+        return bool(self._metrics_cache) and (time.monotonic() - self._metrics_cache_time < self._cache_ttl)
+
     async def get_circulating_supply(self) -> Dict[str, int]:
         """Fetches and caches circulating supply metrics from API."""
-        import time
-        current_time = time.time()
-        
         # Return cache if valid
-        if self._metrics_cache and (current_time - self._metrics_cache_time < self._cache_ttl):
+        if self._cache_is_fresh():
             return self._metrics_cache
         
+        async with self._refresh_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._cache_is_fresh():
+                return self._metrics_cache
+            return await self._refresh_circulating_supply()
+
+    async def _refresh_circulating_supply(self) -> Dict[str, int]:
+        """Fetches supply metrics from the API and updates the cache."""
+        current_time = time.monotonic()
+        
         # Check for stale cache and warn
-        cache_age = current_time - self._metrics_cache_time if self._metrics_cache_time > 0 else 0
+        cache_age = current_time - self._metrics_cache_time if self._metrics_cache else 0
         if cache_age > self._stale_threshold and self._metrics_cache:
             logger.warning(f"⚠️ Metrics cache is stale ({cache_age:.0f}s old). Using cached data.")
             self._using_stale_cache = True
@@ -173,12 +195,11 @@ class PriceModel:
             # Get latest data point from list
             latest = data[-1]
             
-            supplies = {}
-            for market, ids in self.MARKET_MAPPING.items():
-                total = 0
-                for item_id in ids:
-                    total += latest.get(item_id, 0)
-                supplies[market] = total
+            supplies = dict.fromkeys(self.MARKET_MAPPING, 0)
+            id_to_markets = self._id_to_markets
+            for item_id, count in latest.items():
+                for market in id_to_markets.get(item_id, ()):
+                    supplies[market] += count
             
             # Update cache and reset failure counter
             self._metrics_cache = supplies
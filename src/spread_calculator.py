@@ -11,6 +11,8 @@ from typing import Dict, Tuple, Optional
 from dataclasses import dataclass
 from collections import deque
 
+from config import YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,8 +73,8 @@ class SpreadCalculator:
                 'market_profiles.yaml'
             )
             if os.path.exists(profiles_path):
-                with open(profiles_path, 'r') as f:
-                    profiles = yaml.safe_load(f) or {}
+                with open(profiles_path, 'rb') as f:
+                    profiles = yaml.load(f, Loader=YamlLoader) or {}
                     # Filter out non-market keys (like _strategy_notes)
                     self._market_profiles = {
                         k: v for k, v in profiles.items() 
@@ -0,0 +1,119 @@
+"""
+Unit tests for the async Blocky client helpers.
+Tests AsyncRateLimiter pacing, AsyncCircuitBreaker transitions and batched market requests.
+"""
+import asyncio
+import time
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+
+class TestAsyncRateLimiter(unittest.IsolatedAsyncioTestCase):
+    """Tests for AsyncRateLimiter."""
+
+    async def test_enforces_window(self):
+        """Test that no more than max_requests are granted per window."""
+        from blocky.async_client import AsyncRateLimiter
+
+        limiter = AsyncRateLimiter(max_requests=3, window_seconds=0.2)
+
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(6)))
+        elapsed = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed, 0.19)
+        self.assertLessEqual(limiter.get_stats()['current_window_size'], 3)
+
+    async def test_waiter_releases_lock_while_sleeping(self):
+        """Test that a caller waiting for a slot doesn't hold the lock."""
+        from blocky.async_client import AsyncRateLimiter
+
+        limiter = AsyncRateLimiter(max_requests=1, window_seconds=0.2)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.05)
+
+        self.assertFalse(waiter.done())
+        self.assertFalse(limiter._lock.locked())
+
+        await waiter
+
+
+class TestAsyncCircuitBreaker(unittest.IsolatedAsyncioTestCase):
+    """Tests for AsyncCircuitBreaker."""
+
+    async def test_opens_and_recovers(self):
+        """Test OPEN after threshold failures, then HALF_OPEN -> CLOSED on successes."""
+        from blocky.async_client import AsyncCircuitBreaker, CircuitBreakerOpen, CircuitBreakerState
+
+        breaker = AsyncCircuitBreaker(failure_threshold=2, recovery_timeout=0.05, half_open_max_calls=2)
+
+        async def fail():
+            raise Exception("boom")
+
+        async def ok():
+            return "ok"
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                await breaker.call(fail)
+        self.assertEqual(breaker.state, CircuitBreakerState.OPEN)
+
+        with self.assertRaises(CircuitBreakerOpen):
+            await breaker.call(ok)
+
+        await asyncio.sleep(0.06)
+        self.assertEqual(await breaker.call(ok), "ok")
+        self.assertEqual(breaker.state, CircuitBreakerState.HALF_OPEN)
+
+        await breaker.call(ok)
+        self.assertEqual(breaker.state, CircuitBreakerState.CLOSED)
+        self.assertEqual(breaker.failure_count, 0)
+
+
+class TestAsyncBlockyBatch(unittest.IsolatedAsyncioTestCase):
+    """Tests for AsyncBlocky batched market helpers."""
+
+    async def test_get_many_orderbooks_skips_failures(self):
+        """Test that batched orderbooks are keyed by market and failures are omitted."""
+        from blocky.async_client import AsyncBlocky
+
+        client = AsyncBlocky(api_key="test")
+
+        async def get_orderbook(market):
+            if market == "gold_iron":
+                raise Exception("API Error 500")
+            return {"success": True, "market": market}
+
+        client.get_orderbook = get_orderbook
+
+        result = await client.get_many_orderbooks(["diam_iron", "gold_iron", "coal_iron"])
+
+        self.assertEqual(list(result), ["diam_iron", "coal_iron"])
+        self.assertEqual(result["coal_iron"]["market"], "coal_iron")
+
+
+class TestRunFastLoop(unittest.TestCase):
+    """Tests for AsyncBlocky.run_fast_loop."""
+
+    def test_runs_without_touching_loop_policy(self):
+        """Test that the coroutine result is returned and the global policy is unchanged."""
+        from blocky.async_client import AsyncBlocky
+
+        policy = asyncio.get_event_loop_policy()
+
+        async def answer():
+            await asyncio.sleep(0)
+            return 42
+
+        self.assertEqual(AsyncBlocky.run_fast_loop(answer()), 42)
+        self.assertIs(asyncio.get_event_loop_policy(), policy)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -41,8 +41,8 @@ class TestBacktestEngine(unittest.TestCase):
         engine.load_candles('diam_iron', candles)
         
         self.assertIn('diam_iron', engine.candles)
-        self.assertEqual(len(engine.candles['diam_iron']), 2)
-        self.assertEqual(engine.candles['diam_iron'][0].close, 51)
+        self.assertEqual(len(engine.candles['diam_iron']['ts']), 2)
+        self.assertEqual(engine.candles['diam_iron']['close'][0], 51)
         
         print("✓ Candle loading works")
     
@@ -126,7 +126,30 @@ class TestBacktestEngine(unittest.TestCase):
         mock_client.get_ohlcv.assert_called_once_with('diam_iron', timeframe='1H')
         
         print("✓ API candle fetching works")
-    
+
+    def test_fetch_candles_many(self):
+        """Test concurrent candle fetching keeps market order and skips failures."""
+        from backtest import BacktestEngine
+
+        engine = BacktestEngine()
+
+        def get_ohlcv(market, timeframe):
+            if market == 'gold_iron':
+                raise Exception("boom")
+            return {'success': True, 'candles': [
+                {'timestamp': 1000, 'o': 50, 'h': 52, 'l': 49, 'c': 51, 'v': 100},
+            ]}
+
+        mock_client = MagicMock()
+        mock_client.get_ohlcv.side_effect = get_ohlcv
+
+        fetched = engine.fetch_candles_many(mock_client, ['diam_iron', 'gold_iron', 'coal_iron'], '1H')
+
+        self.assertEqual([len(c) for c in fetched], [1, 0, 1])
+        self.assertEqual(list(engine.candles), ['diam_iron', 'coal_iron'])
+
+        print("✓ Concurrent candle fetching works")
+
     def test_order_simulation(self):
         """Test order placement and fill simulation."""
         from backtest import BacktestEngine
@@ -143,6 +166,136 @@ class TestBacktestEngine(unittest.TestCase):
         
         print("✓ Order placement works")
 
+    def test_run_sweep_matches_run(self):
+        """Test that a parameter sweep matches individual runs."""
+        from backtest import BacktestEngine
+
+        candles = [
+            {'timestamp': 1000 + i * 3600, 'open': 50, 'high': 50 + i % 3, 'low': 49 - i % 2,
+             'close': 50 + (i % 5) * 0.5, 'volume': 10}
+            for i in range(50)
+        ]
+        engine = BacktestEngine(initial_capital=1000.0)
+        engine.load_candles('diam_iron', candles)
+
+        results = engine.run_sweep([0.02, 0.05], [10.0, 100.0], min_spread_ticks=0.01)
+
+        self.assertEqual(len(results), 4)
+        for result, (spread, target) in zip(results, [(0.02, 10.0), (0.02, 100.0), (0.05, 10.0), (0.05, 100.0)]):
+            single = engine.run(spread=spread, target_value=target, min_spread_ticks=0.01)
+            self.assertEqual(result.total_trades, single.total_trades)
+            self.assertAlmostEqual(result.final_capital, single.final_capital)
+            self.assertAlmostEqual(result.sharpe_ratio, single.sharpe_ratio)
+
+        print("✓ Parameter sweep works")
+
+    def test_run_matches_per_candle_reference(self):
+        """Test that the vectorized run matches the original per-candle loop, half-cent ties included."""
+        import random
+        from backtest import BacktestEngine
+
+        for seed in range(20):
+            rng = random.Random(seed)
+            markets = {}
+            for market in ('diam_iron', 'gold_iron', 'diam_coal'):
+                candles = []
+                for step in rng.sample(range(80), rng.randint(20, 60)):
+                    # Whole-cent highs/lows so mids often land on half a cent
+                    low = rng.randint(100, 5000) / 100
+                    high = low + rng.randint(0, 300) / 100
+                    candles.append({'timestamp': 1000 + step * 3600, 'open': low,
+                                    'high': high, 'low': low,
+                                    'close': rng.randint(int(low * 100), int(high * 100)) / 100,
+                                    'volume': 10})
+                markets[market] = candles
+
+            engine = BacktestEngine(initial_capital=1000.0)
+            for market, candles in markets.items():
+                engine.load_candles(market, candles)
+
+            for spread, target, min_ticks in ((0.0, 10.0, 0.01), (0.05, 100.0, 0.03), (0.001, 25.0, 0.05)):
+                result = engine.run(spread=spread, target_value=target, min_spread_ticks=min_ticks)
+                expected = _reference_run(markets, 1000.0, spread, target, min_ticks)
+
+                self.assertEqual([(t['market'], t['side'], t['price']) for t in result.trades],
+                                 expected['trades'])
+                self.assertAlmostEqual(result.final_capital, expected['final_capital'], places=9)
+                self.assertAlmostEqual(result.max_drawdown, expected['max_drawdown'], places=9)
+                self.assertAlmostEqual(result.sharpe_ratio, expected['sharpe_ratio'], places=6)
+
+        print("✓ Vectorized run matches per-candle reference")
+
+
+def _reference_run(markets, initial_capital, spread, target_value, min_spread_ticks):
+    """Original per-candle backtest loop, kept as a reference for the vectorized engine."""
+    import statistics
+    from collections import defaultdict
+
+    data = {m: sorted(c, key=lambda c: c['timestamp']) for m, c in markets.items()}
+    capital = initial_capital
+    inventory = defaultdict(float)
+    orders, trades = [], []
+    equity_curve = [initial_capital]
+    max_equity, max_drawdown = initial_capital, 0.0
+
+    for ts in sorted({c['timestamp'] for candles in data.values() for c in candles}):
+        for market, candles in data.items():
+            candle = next((c for c in candles if c['timestamp'] == ts), None)
+            if not candle:
+                continue
+            base = market.split('_')[0]
+
+            for order in [o for o in orders if not o['filled'] and o['market'] == market]:
+                if (candle['low'] <= order['price'] if order['side'] == 'buy'
+                        else candle['high'] >= order['price']):
+                    order['filled'] = True
+                    value = order['price'] * order['qty']
+                    if order['side'] == 'buy':
+                        capital -= value
+                        inventory[base] += order['qty']
+                    else:
+                        capital += value
+                        inventory[base] -= order['qty']
+                    trades.append((market, order['side'], order['price']))
+
+            mid = (candle['high'] + candle['low']) / 2
+            buy_price = round(mid * (1 - spread / 2), 2)
+            sell_price = round(mid * (1 + spread / 2), 2)
+            if sell_price - buy_price < min_spread_ticks:
+                buy_price = round(mid - min_spread_ticks / 2, 2)
+                sell_price = round(mid + min_spread_ticks / 2, 2)
+            qty = min(target_value / buy_price, 6400) if buy_price > 0 else 0
+
+            def has_open(side):
+                return any(o['market'] == market and o['side'] == side and not o['filled'] for o in orders)
+
+            if capital >= buy_price * qty and qty > 0 and not has_open('buy'):
+                orders.append({'market': market, 'side': 'buy', 'price': buy_price, 'qty': qty, 'filled': False})
+            if inventory[base] >= qty and qty > 0 and not has_open('sell'):
+                orders.append({'market': market, 'side': 'sell', 'price': sell_price, 'qty': qty, 'filled': False})
+
+        equity = capital
+        for base, qty in inventory.items():
+            for market, candles in data.items():
+                if market.startswith(base):
+                    last = next((c for c in reversed(candles) if c['timestamp'] <= ts), None)
+                    if last:
+                        equity += qty * last['close']
+                        break
+        equity_curve.append(equity)
+        max_equity = max(max_equity, equity)
+        drawdown = (max_equity - equity) / max_equity if max_equity > 0 else 0
+        max_drawdown = max(max_drawdown, drawdown)
+
+    returns = [(b - a) / a for a, b in zip(equity_curve, equity_curve[1:]) if a > 0]
+    sharpe = 0
+    if returns:
+        std = statistics.stdev(returns) if len(returns) > 1 else 1
+        sharpe = statistics.mean(returns) / std * len(returns) ** 0.5 if std > 0 else 0
+
+    return {'trades': trades, 'final_capital': capital + sum(inventory.values()),
+            'max_drawdown': max_drawdown, 'sharpe_ratio': sharpe}
+
 
 class TestBacktestConfig(unittest.TestCase):
     """Test backtest uses config correctly."""
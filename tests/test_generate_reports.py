@@ -0,0 +1,271 @@
+"""
+Unit tests for the report generator's file readers.
+Compares the date-windowed mmap readers against a plain line-by-line scan.
+"""
+import json
+import random
+import tempfile
+import unittest
+import sys
+import os
+from collections import defaultdict
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import generate_reports
+
+DAYS = ["2026-10-13", "2026-10-14", "2026-10-15", "2026-10-16", "2026-10-17"]
+# Dates to query: every day in the files, plus one before and one after
+QUERY_DAYS = ["2026-10-12"] + DAYS + ["2026-10-18"]
+# Enough lines per day that a day spans well over TS_WINDOW_SLACK
+LINES_PER_DAY = 1500
+
+LOG_MESSAGES = [
+    "INFO     │ diam_iron: Placed buy order 12 @ 50.25",
+    "INFO     │ gold_iron: Placed sell order 13 @ 70.10",
+    "INFO     │ Cancelling order 14 for diam_iron",
+    "ERROR    │ Circuit breaker open for coal_iron",
+    "ERROR    │ Request timeout after 10s",
+    "WARNING  │ Spread below minimum for gold_iron",
+    "INFO     │ Integrity Check passed",
+    "INFO     │ Heartbeat ok",
+]
+
+
+def _log_lines(rng: random.Random) -> list:
+    """Build a time-ordered bot.log, with traceback continuation lines after some errors."""
+    lines = []
+    for day in DAYS:
+        for i in range(LINES_PER_DAY):
+            seconds = i * 86399 // (LINES_PER_DAY - 1)  # First line at 00:00:00, last at 23:59:59
+            stamp = f"{day} {seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+            message = rng.choice(LOG_MESSAGES)
+            lines.append(f"{stamp} │ {message}")
+            if message.startswith("ERROR") and rng.random() < 0.3:
+                lines += [
+                    "Traceback (most recent call last):",
+                    '  File "main.py", line 10, in run',
+                    "ValueError: bad payload",
+                ]
+    return lines
+
+
+def _jsonl_lines(rng: random.Random) -> list:
+    """Build a time-ordered DataRecorder-style JSONL file, with a few undecodable or ts-less lines."""
+    lines = []
+    for day in DAYS:
+        for i in range(LINES_PER_DAY):
+            seconds = i * 86399 // (LINES_PER_DAY - 1)
+            ts = f"{day}T{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}.{i:06d}"
+            lines.append(json.dumps({"ts": ts, "data": {"mid": rng.randint(100, 200), "seq": i}}))
+            roll = rng.random()
+            if roll < 0.01:
+                lines.append('{"ts": "' + day + 'T00:00')  # Truncated write
+            elif roll < 0.02:
+                lines.append(json.dumps({"data": {"note": "no ts"}}))
+    return lines
+
+
+def _write_lines(path: Path, lines: list, newline: str = "\n", trailing: bool = True):
+    """Write lines with the given line ending, optionally without a final newline."""
+    text = newline.join(lines) + (newline if trailing and lines else "")
+    path.write_bytes(text.encode("utf-8"))
+
+
+def _scan_log_file(log_file: Path, date_str: str) -> dict:
+    """Reference parse_log_file: read every line and keep those mentioning the date."""
+    stats = {
+        "orders_placed": 0,
+        "orders_cancelled": 0,
+        "errors": [],
+        "warnings": [],
+        "markets_active": set(),
+        "integrity_checks": 0,
+    }
+    if not log_file.exists():
+        return stats
+
+    with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            if date_str not in line:
+                continue
+            if "Placed buy order" in line or "Placed sell order" in line:
+                stats["orders_placed"] += 1
+                parts = line.split("│")
+                if len(parts) >= 3:
+                    stats["markets_active"].add(parts[2].strip().split(":")[0])
+            elif "Cancelling order" in line:
+                stats["orders_cancelled"] += 1
+            elif "ERROR" in line:
+                stats["errors"].append(line.strip()[-200:])
+            elif "WARNING" in line:
+                stats["warnings"].append(line.strip()[-200:])
+            elif "Integrity Check" in line:
+                stats["integrity_checks"] += 1
+    return stats
+
+
+def _scan_jsonl(data_dir: Path, prefix: str, date_str: str) -> dict:
+    """Reference JSONL reader: decode every line and keep records whose ts starts with the date."""
+    records = defaultdict(list)
+    for filepath in data_dir.glob(f"{prefix}_*.jsonl"):
+        market = filepath.stem.replace(f"{prefix}_", "")
+        with open(filepath, 'r') as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if data.get("ts", "").startswith(date_str):
+                    records[market].append(data)
+    return dict(records)
+
+
+class TestParseLogFile(unittest.TestCase):
+    """Tests for parse_log_file against a full line scan."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.logs_dir = Path(self._tmp.name)
+        self.log_file = self.logs_dir / "bot.log"
+        patcher = patch.object(generate_reports, "LOGS_DIR", self.logs_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+        self.lines = _log_lines(random.Random(7))
+
+    def assertMatchesScan(self, date_str: str):
+        expected = _scan_log_file(self.log_file, date_str)
+        actual = generate_reports.parse_log_file(date_str)
+        actual["markets_active"] = set(actual["markets_active"])
+        self.assertEqual(actual, expected, date_str)
+        return actual
+
+    def test_matches_scan_across_days(self):
+        """Test every day, including first/last lines at the day boundaries and days not in the file."""
+        _write_lines(self.log_file, self.lines)
+        for date_str in QUERY_DAYS:
+            stats = self.assertMatchesScan(date_str)
+            if date_str in DAYS:
+                self.assertGreater(stats["orders_placed"], 0)
+
+    def test_crlf_line_endings(self):
+        """Test a log written with CRLF line endings."""
+        _write_lines(self.log_file, self.lines, newline="\r\n")
+        for date_str in QUERY_DAYS:
+            self.assertMatchesScan(date_str)
+
+    def test_no_trailing_newline(self):
+        """Test a log whose last line isn't newline-terminated."""
+        self.lines.append(f"{DAYS[-1]} 23:59:59 │ ERROR    │ Connection reset by peer")
+        _write_lines(self.log_file, self.lines, trailing=False)
+        for date_str in QUERY_DAYS:
+            self.assertMatchesScan(date_str)
+        self.assertIn("Connection reset by peer",
+                      generate_reports.parse_log_file(DAYS[-1])["errors"][-1])
+
+    def test_leading_continuation_lines(self):
+        """Test a log that starts with lines that carry no timestamp."""
+        _write_lines(self.log_file, ["Traceback (most recent call last):", "  ..."] + self.lines)
+        for date_str in QUERY_DAYS:
+            self.assertMatchesScan(date_str)
+
+    def test_empty_file(self):
+        """Test that an empty log yields empty stats."""
+        self.log_file.write_bytes(b"")
+        stats = self.assertMatchesScan(DAYS[0])
+        self.assertEqual(stats["orders_placed"], 0)
+
+    def test_out_of_order_within_slack(self):
+        """Test that a line written shortly after the next day began is still counted."""
+        next_day = self.lines.index(next(l for l in self.lines if l.startswith(DAYS[3])))
+        self.lines.insert(next_day + 5, f"{DAYS[2]} 23:59:58 │ INFO     │ coal_iron: Placed buy order 99 @ 1.00")
+        _write_lines(self.log_file, self.lines)
+        stats = self.assertMatchesScan(DAYS[2])
+        self.assertIn("coal_iron", stats["markets_active"])
+
+    def test_out_of_order_beyond_slack_is_skipped(self):
+        """Test the documented limit: a date line far outside its day's range is not read."""
+        self.lines.append(f"{DAYS[2]} 23:59:58 │ INFO     │ coal_iron: Placed buy order 99 @ 1.00")
+        _write_lines(self.log_file, self.lines)
+        expected = _scan_log_file(self.log_file, DAYS[2])
+        stats = generate_reports.parse_log_file(DAYS[2])
+        self.assertEqual(stats["orders_placed"], expected["orders_placed"] - 1)
+        self.assertNotIn("coal_iron", stats["markets_active"])
+
+
+class TestDatedJsonl(unittest.TestCase):
+    """Tests for the snapshot/orderbook JSONL readers against a full line scan."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self._tmp.name)
+        patcher = patch.object(generate_reports, "DATA_DIR", self.data_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+        rng = random.Random(11)
+        self.files = {
+            "snapshot_diam_iron.jsonl": _jsonl_lines(rng),
+            "snapshot_gold_iron.jsonl": _jsonl_lines(rng),
+            "orderbook_diam_iron.jsonl": _jsonl_lines(rng),
+        }
+
+    def write_files(self, newline: str = "\n", trailing: bool = True):
+        for name, lines in self.files.items():
+            _write_lines(self.data_dir / name, lines, newline=newline, trailing=trailing)
+
+    def assertMatchesScan(self):
+        for date_str in QUERY_DAYS:
+            self.assertEqual(generate_reports.parse_snapshots(date_str),
+                             _scan_jsonl(self.data_dir, "snapshot", date_str), date_str)
+            self.assertEqual(generate_reports.parse_orderbooks(date_str),
+                             _scan_jsonl(self.data_dir, "orderbook", date_str), date_str)
+
+    def test_matches_scan_across_days(self):
+        """Test every day, including day boundaries, truncated lines and lines without ts."""
+        self.write_files()
+        self.assertMatchesScan()
+        self.assertEqual(len(generate_reports.parse_snapshots(DAYS[1])["gold_iron"]), LINES_PER_DAY)
+
+    def test_crlf_line_endings(self):
+        """Test JSONL files written with CRLF line endings."""
+        self.write_files(newline="\r\n")
+        self.assertMatchesScan()
+
+    def test_no_trailing_newline(self):
+        """Test JSONL files whose last record isn't newline-terminated."""
+        self.write_files(trailing=False)
+        self.assertMatchesScan()
+
+    def test_empty_file(self):
+        """Test that an empty file contributes no records."""
+        self.write_files()
+        (self.data_dir / "snapshot_coal_iron.jsonl").write_bytes(b"")
+        self.assertMatchesScan()
+        self.assertNotIn("coal_iron", generate_reports.parse_snapshots(DAYS[0]))
+
+    def test_out_of_order_within_slack(self):
+        """Test that a record appended shortly after the next day began is still read."""
+        lines = self.files["snapshot_diam_iron.jsonl"]
+        next_day = lines.index(next(l for l in lines if f'"ts": "{DAYS[3]}' in l))
+        lines.insert(next_day + 5, json.dumps({"ts": f"{DAYS[2]}T23:59:59.999999", "data": {"late": True}}))
+        self.write_files()
+        self.assertMatchesScan()
+        self.assertTrue(generate_reports.parse_snapshots(DAYS[2])["diam_iron"][-1]["data"].get("late"))
+
+    def test_stream_market_stats_counts_match(self):
+        """Test that streamed per-market sample counts match the scanned record counts."""
+        self.write_files()
+        for date_str in DAYS:
+            stats = generate_reports.stream_market_stats(date_str)
+            scanned = _scan_jsonl(self.data_dir, "snapshot", date_str)
+            self.assertEqual({m: st["samples"] for m, st in stats.items()},
+                             {m: len(records) for m, records in scanned.items()})
+
+
+if __name__ == "__main__":
+    unittest.main()
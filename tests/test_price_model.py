@@ -109,6 +109,27 @@ class TestPriceModel(unittest.TestCase):
         model.get_circulating_supply()
         self.assertEqual(self.mock_client.get_supply_metrics.call_count, 1)
         
+    def test_concurrent_refresh_fetches_once(self):
+        """Test that concurrent callers on a cold cache share one API fetch."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from price_model import PriceModel
+
+        async def slow_metrics():
+            await asyncio.sleep(0.01)
+            return [{"1": 100, "4": 50}]
+
+        self.mock_client.get_supply_metrics = AsyncMock(side_effect=slow_metrics)
+        model = PriceModel(self.mock_client)
+
+        async def run():
+            return await asyncio.gather(*(model.get_circulating_supply() for _ in range(5)))
+
+        results = asyncio.run(run())
+
+        self.assertEqual(self.mock_client.get_supply_metrics.await_count, 1)
+        self.assertTrue(all(r["ston_iron"] == 150 for r in results))
+
     def test_is_healthy(self):
         """Test health check method."""
         from price_model import PriceModel
@@ -8,7 +8,6 @@ import os
 import sys
 import asyncio
 import threading
-import webbrowser
 from pathlib import Path
 
 # Add src to path BEFORE any imports
@@ -38,6 +37,7 @@ class BlockyTrayApp:
         self.running = False
         self.icon = None
         self.loop = None
+        self._stop_event = None
         
     def create_icon_image(self):
         """Create a simple icon image programmatically."""
@@ -166,13 +166,14 @@ class BlockyTrayApp:
                 
                 self.running = True
                 dashboard = TradingDashboard(bot=None, port=8081)
+                self._stop_event = asyncio.Event()
                 
                 async def serve():
                     await dashboard.start()
                     print("Dashboard server started on http://localhost:8081")
-                    # Keep running
-                    while self.running:
-                        await asyncio.sleep(1)
+                    # Idle until stop_bot() signals, instead of waking up to poll
+                    await self._stop_event.wait()
+                    await dashboard.stop()
                 
                 self.loop.run_until_complete(serve())
             except Exception as e:
@@ -181,6 +182,7 @@ class BlockyTrayApp:
                 traceback.print_exc()
             finally:
                 self.running = False
+                self._stop_event = None
                 if self.loop:
                     self.loop.close()
         
@@ -197,16 +199,21 @@ class BlockyTrayApp:
         
         # Signal the event loop to stop
         if self.loop and self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.loop.stop)
+            if self._stop_event is not None:
+                self.loop.call_soon_threadsafe(self._stop_event.set)
+            else:
+                self.loop.call_soon_threadsafe(self.loop.stop)
         
         print("Bot stopping...")
     
     def open_dashboard(self, icon=None, item=None):
         """Open dashboard in browser."""
+        import webbrowser
         webbrowser.open(self.DASHBOARD_URL)
     
     def open_setup(self, icon=None, item=None):
         """Open setup wizard in browser."""
+        import webbrowser
         webbrowser.open(self.SETUP_URL)
     
     def on_quit(self, icon=None, item=None):
@@ -259,7 +266,7 @@ class BlockyTrayApp:
             server_ready = self.wait_for_server("http://localhost:8081/api/needs-setup", timeout=15)
             if server_ready:
                 print("Opening setup wizard...")
-                webbrowser.open(self.SETUP_URL)
+                self.open_setup()
             else:
                 print("ERROR: Dashboard failed to start. Check console for errors.")
         else:
@@ -270,7 +277,7 @@ class BlockyTrayApp:
             if not server_ready:
                 print("WARNING: Server did not start in time. Try refreshing browser manually.")
             print("Opening dashboard...")
-            webbrowser.open(self.DASHBOARD_URL)
+            self.open_dashboard()
         
         # Create and run system tray icon
         self.icon = pystray.Icon(